@@ -3,24 +3,50 @@
 
 if "bpy" in locals():
     import importlib
+    importlib.reload(extents)
+    importlib.reload(profiling)
+    importlib.reload(deferred)
+    importlib.reload(meshops)
+    importlib.reload(export)
+    importlib.reload(sections)
+    importlib.reload(utils)
     importlib.reload(fittings_props)
     importlib.reload(materials_props)
     importlib.reload(support_props)
     importlib.reload(support_list)
     importlib.reload(instrument_list)
     importlib.reload(case_props)
+    importlib.reload(proxy)
+    importlib.reload(generator)
+    importlib.reload(parallel)
+    importlib.reload(preview)
+    importlib.reload(placement)
     importlib.reload(supports)
+    importlib.reload(headless)
     importlib.reload(ui)
 
 import bpy
 from bpy.props import PointerProperty
-from . import (fittings_props,
+from . import (extents,
+               utils,
+               profiling,
+               deferred,
+               fittings_props,
                materials_props,
                support_props,
                support_list,
                instrument_list,
                case_props,
+               meshops,
+               export,
+               sections,
+               proxy,
+               generator,
+               parallel,
+               preview,
+               placement,
                supports,
+               headless,
                ui)
 
 modules = (fittings_props,
@@ -30,6 +56,9 @@ modules = (fittings_props,
            instrument_list,
            case_props,
            supports,
+           placement,
+           profiling,
+           export,
            ui)
 
 def register():
@@ -41,8 +70,18 @@ def register():
     bpy.types.Scene.support_props = PointerProperty(type=support_props.SupportProperties)
     bpy.types.Scene.fittings_props = PointerProperty(type=fittings_props.FittingsProperties)
     bpy.types.Scene.materials_props = PointerProperty(type=materials_props.MaterialsProperties)
+    extents.register_handlers()
+    generator.register_handlers()
+    utils.register_handlers()
 
 def unregister():
+    deferred.cancel()
+    preview.clear_cache()
+    proxy.clear_cache()
+    sections.clear_cache()
+    generator.unregister_handlers()
+    utils.unregister_handlers()
+    extents.unregister_handlers()
     for m in modules:
         for c in m.registration_list:
             bpy.utils.unregister_class(c)
@@ -0,0 +1,35 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026 DTRabbit
+
+# Generate supports from a JSON job spec without the UI, see headless.py
+#   blender -b [file.blend] --python batch.py -- job.json [job.json ...]
+#   python batch.py job.json [job.json ...]      (with the bpy module)
+# The reports are printed as JSON, the exit status is 1 if anything failed
+
+import importlib
+import json
+import os
+import sys
+
+def main(argv):
+    specs = argv[argv.index("--") + 1:] if "--" in argv else argv[1:]
+    # import the add-on as a package so its relative imports work
+    addon_dir = os.path.dirname(os.path.abspath(__file__))
+    sys.path.insert(0, os.path.dirname(addon_dir))
+    package = importlib.import_module(os.path.basename(addon_dir))
+    import bpy
+    if not hasattr(bpy.types.Scene, "case_props"):
+        package.register()
+    headless = importlib.import_module(package.__name__ + ".headless")
+    ok = True
+    for spec in specs:
+        try:
+            report = headless.run(spec)
+        except Exception as e:
+            report = {"spec": spec, "ok": False, "errors": [{"error": str(e)}]}
+        print(json.dumps(report))
+        ok = ok and report["ok"]
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main(sys.argv)
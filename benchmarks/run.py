@@ -0,0 +1,325 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026 DTRabbit
+
+# Support generator benchmarks, not tests
+#   blender -b --factory-startup --python benchmarks/run.py -- [options]
+#   python benchmarks/run.py [options]               (with the bpy module)
+# options
+#   --out results.json        where to write the results
+#   --sizes 10000,100000      instrument triangle counts (default 10k, 100k, 1M)
+#   --shapes tube,bell,body   synthetic instruments to use
+#   --supports 1,4,8          support counts
+#   --repeat 3                runs of each timing, the median and min are kept
+#   --operators               also time the operator engine (up to 100k)
+#   --no-example              skip Example.blend
+#   --compare old.json        print the change against an earlier results file
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ADDON_DIR = os.path.dirname(BENCH_DIR)
+
+# fastener settings the builds are timed with
+FASTENERS = {"default": {},
+             "large": {"screw_diam": 0.006, "screw_length": 0.02, "nut_diam": 0.011,
+                       "washer_diam": 0.012, "washer_depth": 0.0012, "slot_length": 0.015}}
+# slower than this many times the earlier run is reported as a regression
+REGRESSION = 1.2
+
+def load_addon():
+    sys.path.insert(0, os.path.dirname(ADDON_DIR))
+    sys.path.insert(0, BENCH_DIR)
+    package = importlib.import_module(os.path.basename(ADDON_DIR))
+    import bpy
+    registered = not hasattr(bpy.types.Scene, "case_props")
+    if registered:
+        package.register()
+    return package, registered
+
+def module(package, name):
+    return importlib.import_module(package.__name__ + "." + name)
+
+def timed(function, setup=None, repeat=3):
+    """
+    Seconds function takes, setup runs untimed before each run
+    Returns (median, min, runs, error)
+    """
+    runs = []
+    for i in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        try:
+            function()
+        except Exception as e:
+            return None, None, runs, str(e)
+        runs.append(time.perf_counter() - start)
+    return statistics.median(runs), min(runs), runs, None
+
+
+class Bench:
+    """
+    Benchmark state, the add-on modules and the results so far
+    """
+
+    def __init__(self, package, repeat):
+        self.bpy = importlib.import_module("bpy")
+        self.meshops = module(package, "meshops")
+        self.generator = module(package, "generator")
+        self.supports = module(package, "supports")
+        self.support_list = module(package, "support_list")
+        self.extents = module(package, "extents")
+        self.utils = module(package, "utils")
+        self.sections = module(package, "sections")
+        self.repeat = repeat
+        self.results = []
+
+    def record(self, case, benchmark, timing, **extra):
+        median, minimum, runs, error = timing
+        self.results.append({"case": case, "benchmark": benchmark, "seconds": median,
+                             "min": minimum, "runs": runs, "error": error, **extra})
+        print("{:<28} {:<24} {}".format(case, benchmark,
+                                        "{:.4f}s".format(median) if error is None else error))
+
+    def scene(self):
+        """
+        The context scene, emptied of instruments and supports
+        """
+        bpy = self.bpy
+        scene = bpy.context.scene
+        for instr_item in scene.case_props.instrument_list:
+            for support_item in instr_item.support_list:
+                self.support_list.remove_parts(support_item)
+        scene.case_props.instrument_list.clear()
+        scene.case_props.instrument_list_index = -1
+        self.utils.forget_lists()
+        for obj in list(scene.collection.objects):
+            bpy.data.objects.remove(obj)
+        bpy.data.orphans_purge(do_recursive=True)
+        self.clear_caches()
+        return scene
+
+    def clear_caches(self):
+        self.extents.clear_cache()
+        self.generator.clear_stages()
+        self.generator._cutter_templates.clear()
+        self.sections.clear_cache()
+
+    def instrument(self, scene, name, arrays):
+        bpy = self.bpy
+        mesh = self.meshops.mesh_from_arrays(bpy.data.meshes.new(name), *arrays)
+        obj = bpy.data.objects.new(name, mesh)
+        scene.collection.objects.link(obj)
+        c_props = scene.case_props
+        c_props.instrument_list.add()
+        c_props.instrument_list[-1].instr = obj
+        c_props.instrument_list_index = len(c_props.instrument_list) - 1
+        self.utils.forget_lists()
+        return c_props.instrument_list[-1]
+
+    def add_supports(self, scene, instr_item, count, fasteners):
+        """
+        count base supports spread along the instrument
+        """
+        length = instr_item.instr.dimensions[0]
+        for i in range(count):
+            support_item = self.support_list.new_support(instr_item, scene.support_props)
+            for name, value in fasteners.items():
+                setattr(support_item.support_props, name, value)
+            support_item.support_props.position = length * (i + 1) / (count + 1)
+            support_item.orientation = 'BASE'
+
+    def jobs(self, scene):
+        return [(instr_item, support_item, support_item.orientation)
+                for instr_item in scene.case_props.instrument_list
+                for support_item in instr_item.support_list]
+
+    def remove_parts(self, scene):
+        for instr_item, support_item, orientation in self.jobs(scene):
+            self.support_list.remove_parts(support_item)
+
+    def build(self, scene, **options):
+        depsgraph = self.generator.scene_depsgraph(scene)
+        depsgraph.update()
+        report = self.generator.build_supports(scene, depsgraph, self.jobs(scene), scene.collection,
+                                               **options)
+        errors = [error for name, seconds, error in report if error is not None]
+        if len(errors) > 0:
+            raise RuntimeError(errors[0])
+
+    def case(self, shape, triangles, count, fasteners, operators):
+        # benchmarks/ is only on the path once load_addon has run
+        from shapes import SHAPES
+        name = "{}-{}k-{}s-{}".format(shape, triangles // 1000, count, fasteners)
+        scene = self.scene()
+        instr_item = self.instrument(scene, shape, SHAPES[shape](triangles))
+        self.add_supports(scene, instr_item, count, FASTENERS[fasteners])
+        info = {"shape": shape, "triangles": len(instr_item.instr.data.polygons),
+                "supports": count, "fasteners": fasteners}
+
+        self.record(name, "update_case cold", timed(lambda: self.utils.update_case(scene),
+                                                    self.extents.clear_cache, self.repeat), **info)
+        self.record(name, "update_case warm", timed(lambda: self.utils.update_case(scene),
+                                                    None, self.repeat), **info)
+        self.record(name, "instrument sections", timed(lambda: self.sections.instrument_sections(
+                                                           instr_item.instr),
+                                                       self.sections.clear_cache, self.repeat), **info)
+
+        def cold():
+            self.remove_parts(scene)
+            self.clear_caches()
+            self.utils.update_case(scene)
+        self.record(name, "build_supports", timed(lambda: self.build(scene), cold, self.repeat), **info)
+
+        # fastener edits only re-run the last stages
+        def slot_edit():
+            self.remove_parts(scene)
+            for instr_item, support_item, orientation in self.jobs(scene):
+                support_item.support_props.slot_length += 0.001
+        self.record(name, "rebuild after slot edit", timed(lambda: self.build(scene), slot_edit,
+                                                          self.repeat), **info)
+        self.record(name, "bevel stage", timed(lambda: self.bevel(scene), None, self.repeat), **info)
+
+        def preview():
+            self.remove_parts(scene)
+            self.generator.clear_stages()
+        self.record(name, "build_supports preview",
+                    timed(lambda: self.build(scene, preview=True, detail=0.5), preview, self.repeat),
+                    **info)
+
+        if operators and triangles <= 100000:
+            self.record(name, "build_support operators",
+                        timed(lambda: self.supports.build_support_batch(None, self.bpy.context,
+                                                                        self.jobs(scene)),
+                              cold, self.repeat), **info)
+
+    def bevel(self, scene):
+        """
+        Run the bevel stage of the first support on its stored inputs
+        """
+        generator = self.generator
+        instr_item, support_item, orientation = self.jobs(scene)[0]
+        signatures = generator._support_stages[support_item.name]
+        s = generator.support_spec(instr_item.instr, support_item, orientation,
+                                   scene.case_props, scene.materials_props)
+        with self.meshops.Scratch() as scratch:
+            inputs = {u: generator.unpack(scratch, generator._stage_store[signatures[u]])
+                      for u in ("flange", "split", "support_block")}
+            generator.stage_bevel(scratch, s, inputs, None)
+
+    def example(self):
+        """
+        Build every support in Example.blend, its meshes are listed as
+        instruments if the list is empty, and three stations are added to
+        instruments without any
+        """
+        bpy = self.bpy
+        bpy.ops.wm.open_mainfile(filepath=os.path.join(ADDON_DIR, "Example.blend"))
+        scene = bpy.context.scene
+        c_props = scene.case_props
+        if len(c_props.instrument_list) == 0:
+            for obj in scene.objects:
+                if obj.type == 'MESH':
+                    c_props.instrument_list.add()
+                    c_props.instrument_list[-1].instr = obj
+            c_props.instrument_list_index = len(c_props.instrument_list) - 1
+            self.utils.forget_lists()
+        for instr_item in c_props.instrument_list:
+            if len(instr_item.support_list) == 0 and instr_item.instr is not None:
+                self.add_supports(scene, instr_item, 3, {})
+        info = {"shape": "Example.blend", "supports": len(self.jobs(scene))}
+
+        def cold():
+            self.remove_parts(scene)
+            self.clear_caches()
+            self.utils.update_case(scene)
+        self.record("example", "update_case cold", timed(lambda: self.utils.update_case(scene),
+                                                         self.extents.clear_cache, self.repeat), **info)
+        self.record("example", "build_supports", timed(lambda: self.build(scene), cold, self.repeat),
+                    **info)
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "-C", ADDON_DIR, "rev-parse", "--short", "HEAD"],
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+def compare(results, old_file):
+    """
+    Print each timing against the same one in an earlier results file
+    Returns the number of regressions
+    """
+    with open(old_file) as f:
+        old = {(r["case"], r["benchmark"]): r for r in json.load(f)["results"]}
+    regressions = 0
+    for r in results:
+        before = old.get((r["case"], r["benchmark"]))
+        if before is None or before["seconds"] is None or r["seconds"] is None:
+            continue
+        ratio = r["seconds"] / before["seconds"]
+        flag = "REGRESSION" if ratio > REGRESSION else ""
+        regressions += ratio > REGRESSION
+        print("{:<28} {:<24} {:.4f}s -> {:.4f}s x{:.2f} {}".format(r["case"], r["benchmark"],
+                                                                  before["seconds"], r["seconds"],
+                                                                  ratio, flag))
+    return regressions
+
+def main(argv):
+    argv = argv[argv.index("--") + 1:] if "--" in argv else argv[1:]
+    parser = argparse.ArgumentParser(description="Support generator benchmarks")
+    parser.add_argument("--out", default="benchmark_results.json")
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--shapes", default="tube,bell,body")
+    parser.add_argument("--supports", default="1,4,8")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--operators", action="store_true")
+    parser.add_argument("--no-example", action="store_true")
+    parser.add_argument("--compare")
+    args = parser.parse_args(argv)
+
+    package, registered = load_addon()
+    bench = Bench(package, args.repeat)
+    start = time.perf_counter()
+    try:
+        for triangles in [int(t) for t in args.sizes.split(",")]:
+            for shape in args.shapes.split(","):
+                for count in [int(c) for c in args.supports.split(",")]:
+                    for fasteners in FASTENERS:
+                        # fastener variations are only worth timing once per instrument
+                        if fasteners != "default" and count != 1:
+                            continue
+                        bench.case(shape, triangles, count, fasteners, args.operators)
+        if not args.no_example:
+            bench.example()
+    finally:
+        # the bpy module doesn't exit with the add-on still registered
+        if registered:
+            package.unregister()
+
+    import bpy
+    import numpy
+    with open(args.out, "w") as f:
+        json.dump({"meta": {"commit": git_commit(),
+                            "blender": bpy.app.version_string,
+                            "numpy": numpy.__version__,
+                            "python": platform.python_version(),
+                            "platform": platform.platform(),
+                            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                            "seconds": time.perf_counter() - start},
+                   "results": bench.results}, f, indent=1)
+    print("results written to", args.out)
+    if args.compare:
+        sys.exit(1 if compare(bench.results, args.compare) > 0 else 0)
+
+if __name__ == "__main__":
+    main(sys.argv)
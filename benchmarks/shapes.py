@@ -0,0 +1,73 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026 DTRabbit
+
+import numpy as np
+
+# Synthetic instruments for the benchmarks, closed triangle meshes lying
+# along X from 0 to their length, as (co, loop_start, loop_verts) arrays
+
+def loft(x, ry, rz, segments):
+    """
+    Closed tube through elliptical rings at x with semi axes ry and rz,
+    the ends are capped with triangle fans
+    """
+    rings = len(x)
+    theta = np.linspace(0, 2 * np.pi, segments, endpoint=False)
+    co = np.empty((rings * segments + 2, 3))
+    co[:-2, 0] = np.repeat(x, segments)
+    co[:-2, 1] = (ry[:, None] * np.cos(theta)).ravel()
+    co[:-2, 2] = (rz[:, None] * np.sin(theta)).ravel()
+    co[-2] = (x[0], 0, 0)
+    co[-1] = (x[-1], 0, 0)
+    # two triangles per quad between neighbouring rings, wound outwards
+    i, j = np.meshgrid(np.arange(rings - 1), np.arange(segments), indexing='ij')
+    a = (i * segments + j).ravel()
+    b = a + segments
+    c = (i * segments + (j + 1) % segments + segments).ravel()
+    d = c - segments
+    sides = np.concatenate([np.stack([a, d, c], axis=1), np.stack([a, c, b], axis=1)])
+    j = np.arange(segments)
+    last = (rings - 1) * segments
+    start_cap = np.stack([np.full(segments, len(co) - 2), (j + 1) % segments, j], axis=1)
+    end_cap = np.stack([np.full(segments, len(co) - 1), last + j, last + (j + 1) % segments], axis=1)
+    tris = np.concatenate([sides, start_cap, end_cap])
+    return co.astype(np.float32), np.arange(len(tris)) * 3, tris.ravel()
+
+def resolution(triangles, aspect=4):
+    """
+    (rings, segments) for about triangles faces, segments round the
+    instrument times aspect is roughly the rings along it
+    """
+    segments = max(16, int(round(np.sqrt(triangles / (2 * aspect)))))
+    return max(2, triangles // (2 * segments)), segments
+
+def tube(triangles):
+    """
+    Straight tube, like a flute
+    """
+    rings, segments = resolution(triangles)
+    x = np.linspace(0, 0.6, rings)
+    r = np.full(rings, 0.02)
+    return loft(x, r, r, segments)
+
+def bell(triangles):
+    """
+    Narrow tube flaring into a bell, like a trumpet
+    """
+    rings, segments = resolution(triangles)
+    x = np.linspace(0, 0.5, rings)
+    r = 0.012 + 0.11 * (x / 0.5) ** 5
+    return loft(x, r, r, segments)
+
+def body(triangles):
+    """
+    Flat body with two bouts and a waist, like a violin
+    """
+    rings, segments = resolution(triangles)
+    x = np.linspace(0, 0.45, rings)
+    envelope = np.maximum(np.sqrt(np.sin(np.pi * x / 0.45)), 0.05)
+    ry = 0.1 * (0.8 - 0.2 * np.cos(4 * np.pi * x / 0.45)) * envelope
+    rz = 0.04 * envelope
+    return loft(x, ry, rz, segments)
+
+SHAPES = {"tube": tube, "bell": bell, "body": body}
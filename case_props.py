@@ -7,12 +7,18 @@ from bpy.props import (CollectionProperty,
                        IntProperty,
                        FloatProperty,
                        BoolProperty,
+                       EnumProperty,
                        FloatVectorProperty)
 
-from .utils import calc_case
+from .utils import update_case
+from .deferred import schedule
 from .instrument_list import InstrumentListItem
 from .support_list import SupportListItem
 
+def clearance_update(self, context):
+    # the instrument boxes are cached, so this is only the clearance arithmetic
+    schedule(context.scene, "case", lambda scene, geometry: update_case(scene))
+
 class CaseProperties(PropertyGroup):
 
     # instrument list
@@ -32,7 +38,28 @@ class CaseProperties(PropertyGroup):
                              min=0.01,
                              max=0.05,
                              unit='LENGTH',
-                             update = calc_case)
+                             update = clearance_update)
+
+    # support generation
+    engine: EnumProperty(name="Engine",
+                         description="How supports are generated",
+                         items=(('DATA', "Data", "Build in memory with bmesh and the data API, works from any mode"),
+                                ('OPERATORS', "Operators", "Build with editor operators in the scene")),
+                         default='DATA')
+    workers: IntProperty(name="Workers",
+                         description="Worker processes used to generate all supports, 0 to build them in Blender itself",
+                         default=0,
+                         min=0,
+                         max=64)
+    profile: BoolProperty(name="Profile",
+                          description="Record where the time goes when supports are generated",
+                          default=False)
+    use_proxy: BoolProperty(name="Instrument proxy",
+                            description="Cut supports from a voxel remeshed copy of each instrument, for scans that are not manifold. The copy is accurate to a quarter of the clearance or pad thickness, and can have many more faces than the instrument",
+                            default=False)
+    live_preview: BoolProperty(name="Live preview",
+                               description="Rebuild a low resolution preview of the active support as its settings change",
+                               default=False)
 
     # calculated properties
     size: FloatVectorProperty(name="",
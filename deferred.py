@@ -0,0 +1,66 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026 DTRabbit
+
+import bpy
+import sys
+import traceback
+from time import monotonic
+
+# time (s) input has to be quiet before pending updates are run
+SETTLE_TIME = 0.15
+
+# pending updates, keyed by (scene name, task name)
+# each entry is [function, geometry flag, due time]
+_pending = {}
+
+def schedule(scene, task, function, geometry=False, delay=SETTLE_TIME):
+    """
+    Queue function(scene, geometry) to run once property input has settled
+    Repeated requests for the same scene and task are coalesced into one call
+    and push it back by delay, the geometry flag is sticky so a burst that
+    needs geometry gets it
+    """
+    key = (scene.name, task)
+    entry = _pending.get(key)
+    now = monotonic()
+    _pending[key] = [function, geometry or (entry is not None and entry[1]), now + delay]
+    # (re)start the timer so it fires for whichever task is due first
+    if bpy.app.timers.is_registered(_run_pending):
+        bpy.app.timers.unregister(_run_pending)
+    bpy.app.timers.register(_run_pending,
+                            first_interval=max(0.0, min(v[2] for v in _pending.values()) - now))
+
+def unschedule(scene, task):
+    _pending.pop((scene.name, task), None)
+
+def _run_pending(force=False):
+    now = monotonic()
+    due = [k for k, v in _pending.items() if force or v[2] <= now]
+    for key in due:
+        function, geometry = _pending.pop(key)[:2]
+        scene = bpy.data.scenes.get(key[0])
+        if scene is None:
+            continue
+        # one failed update must not stop the others or the timer
+        try:
+            function(scene, geometry)
+        except Exception:
+            print("Cases: deferred", key[1], "failed", file=sys.stderr)
+            traceback.print_exc()
+    if len(_pending) == 0:
+        return None
+    return max(0.01, min(v[2] for v in _pending.values()) - monotonic())
+
+def flush():
+    """
+    Run anything still pending straight away
+    """
+    if len(_pending) > 0:
+        _run_pending(force=True)
+
+def cancel():
+    _pending.clear()
+    if bpy.app.timers.is_registered(_run_pending):
+        bpy.app.timers.unregister(_run_pending)
+
+registration_list = []
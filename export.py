@@ -0,0 +1,172 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026 DTRabbit
+
+import bpy
+import io
+import os
+import zipfile
+import numpy as np
+from bpy.types import Operator
+from bpy.props import StringProperty, EnumProperty, FloatProperty, IntProperty
+
+from concurrent.futures import ThreadPoolExecutor
+
+# Export of generated parts straight from the mesh buffers, no selection
+# or exporter operators. Mesh data is read on the main thread, files (or
+# the 3MF object XML) are then written by a pool of threads, numpy and file
+# writes let go of the GIL.
+
+SUFFIXES = (("support", "H"), ("pad", "P"), ("clamp", "C"), ("nut_plate", "N"))
+
+STL_RECORD = np.dtype([("normal", "<f4", (3,)), ("verts", "<f4", (3, 3)), ("attr", "<u2")])
+
+def generated_parts(scene):
+    """
+    (file name, object) for every generated part in scene, previews are
+    left out
+    """
+    parts = []
+    for instr_item in scene.case_props.instrument_list:
+        for support_item in instr_item.support_list:
+            if support_item.preview:
+                continue
+            for attr, suffix in SUFFIXES:
+                obj = getattr(support_item, attr)
+                if obj is not None and obj.type == 'MESH':
+                    parts.append((bpy.path.clean_name(support_item.name + suffix), obj))
+    return parts
+
+def mesh_triangles(obj, scale=1.0):
+    """
+    World space vertex coordinates (n, 3) and triangle vertex indices (m, 3)
+    of obj, read with foreach_get
+    """
+    mesh = obj.data
+    mesh.calc_loop_triangles()
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("vertices", tris)
+    m = np.array(obj.matrix_world, dtype=np.float64)
+    co = (co.reshape(-1, 3) @ m[:3, :3].T + m[:3, 3]) * scale
+    return co.astype(np.float32), tris.reshape(-1, 3)
+
+def write_stl(filepath, co, tris):
+    """
+    Binary STL of the triangles, written as one buffer
+    """
+    records = np.zeros(len(tris), dtype=STL_RECORD)
+    verts = co[tris]
+    records["verts"] = verts
+    normal = np.cross(verts[:, 1] - verts[:, 0], verts[:, 2] - verts[:, 0])
+    length = np.linalg.norm(normal, axis=1, keepdims=True)
+    records["normal"] = np.divide(normal, length, out=np.zeros_like(normal), where=length > 0)
+    with open(filepath, "wb") as f:
+        f.write(b"Cases binary STL".ljust(80, b"\0"))
+        f.write(np.uint32(len(tris)).tobytes())
+        records.tofile(f)
+    return filepath
+
+def model_object_xml(object_id, name, co, tris):
+    """
+    3MF <object> element for one part
+    """
+    out = io.BytesIO()
+    out.write('<object id="{}" name="{}" type="model"><mesh><vertices>\n'.format(
+        object_id, name).encode())
+    np.savetxt(out, co, fmt='<vertex x="%.6f" y="%.6f" z="%.6f"/>')
+    out.write(b"</vertices><triangles>\n")
+    np.savetxt(out, tris, fmt='<triangle v1="%d" v2="%d" v3="%d"/>')
+    out.write(b"</triangles></mesh></object>\n")
+    return out.getvalue()
+
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>
+</Types>
+"""
+
+RELS = """<?xml version="1.0" encoding="UTF-8"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Target="/3D/3dmodel.model" Id="rel0" Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>
+</Relationships>
+"""
+
+def write_3mf(filepath, parts, threads=None):
+    """
+    One 3MF holding every part as its own object
+    parts: [(name, co, tris)] with co in millimetres
+    """
+    with ThreadPoolExecutor(threads) as pool:
+        objects = list(pool.map(lambda p: model_object_xml(p[0] + 1, *p[1]), enumerate(parts)))
+    with zipfile.ZipFile(filepath, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("[Content_Types].xml", CONTENT_TYPES)
+        z.writestr("_rels/.rels", RELS)
+        with z.open("3D/3dmodel.model", "w") as f:
+            f.write(b'<?xml version="1.0" encoding="UTF-8"?>\n'
+                    b'<model unit="millimeter" xml:lang="en-US" '
+                    b'xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">\n<resources>\n')
+            for xml in objects:
+                f.write(xml)
+            f.write(b"</resources>\n<build>\n")
+            for i in range(len(parts)):
+                f.write('<item objectid="{}"/>\n'.format(i + 1).encode())
+            f.write(b"</build>\n</model>\n")
+    return filepath
+
+def export_parts(scene, directory, format='STL', scale=1000.0, filename="supports", threads=None):
+    """
+    Export every generated part in scene to directory, one binary STL per
+    part or a single 3MF, scale converts metres to the file's units (3MF
+    is always millimetres)
+    Returns the files written
+    """
+    os.makedirs(directory, exist_ok=True)
+    # bpy is only touched here, on the main thread
+    parts = [(name, mesh_triangles(obj, scale)) for name, obj in generated_parts(scene)]
+    if format == '3MF':
+        return [write_3mf(os.path.join(directory, filename + ".3mf"),
+                          [(name, co, tris) for name, (co, tris) in parts], threads)]
+    with ThreadPoolExecutor(threads) as pool:
+        return list(pool.map(lambda p: write_stl(os.path.join(directory, p[0] + ".stl"), *p[1]),
+                             parts))
+
+
+class ExportSupports(Operator):
+    bl_idname = "export.supports"
+    bl_label = "Export supports"
+    bl_description = "Export every generated holder, pad, clamp and nut plate"
+
+    directory: StringProperty(subtype='DIR_PATH')
+    format: EnumProperty(name="Format",
+                         items=(('STL', "STL", "A binary STL file per part"),
+                                ('3MF', "3MF", "One 3MF file with every part")),
+                         default='STL')
+    filename: StringProperty(name="3MF name", default="supports")
+    scale: FloatProperty(name="Scale",
+                         description="STL units per metre, 1000 for millimetres",
+                         default=1000.0,
+                         min=0.001)
+    threads: IntProperty(name="Threads",
+                         description="Files written at once, 0 for one per processor",
+                         default=0,
+                         min=0)
+
+    @classmethod
+    def poll(cls, context):
+        return any(s.support is not None for i in context.scene.case_props.instrument_list
+                                         for s in i.support_list)
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        files = export_parts(context.scene, bpy.path.abspath(self.directory), self.format,
+                             1000.0 if self.format == '3MF' else self.scale, self.filename,
+                             self.threads or None)
+        self.report({'INFO'}, "Exported {} file{}".format(len(files), "" if len(files) == 1 else "s"))
+        return {'FINISHED'}
+
+registration_list = (ExportSupports,)
@@ -0,0 +1,131 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026 DTRabbit
+
+import bpy
+import numpy as np
+from bpy.app.handlers import persistent
+
+# world space boxes of instruments, keyed by object session uid
+# each entry is (mesh session uid, fingerprint, (min, max))
+_bounds_cache = {}
+# count of geometry updates seen, keyed by object or mesh session uid
+_versions = {}
+
+def world_coords(obj):
+    """
+    World space vertex coordinates of obj as an (n, 3) array
+    Meshes are read straight from the vertex buffer, anything else
+    falls back to the corners of its bounding box
+    """
+    if obj.type == 'MESH':
+        mesh = obj.data
+        co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", co)
+        co = co.reshape(-1, 3)
+    else:
+        co = np.array([tuple(c) for c in obj.bound_box], dtype=np.float32)
+    m = np.array(obj.matrix_world, dtype=np.float64)
+    return co @ m[:3, :3].T + m[:3, 3]
+
+def object_bounds(obj):
+    """
+    World space axis aligned bounding box of obj as (min, max) arrays,
+    or None if obj has no geometry
+    """
+    co = world_coords(obj)
+    if len(co) == 0:
+        return None
+    return co.min(axis=0), co.max(axis=0)
+
+def merge_bounds(boxes):
+    """
+    Smallest box enclosing all (min, max) boxes, None entries are ignored
+    """
+    boxes = [b for b in boxes if b is not None]
+    if len(boxes) == 0:
+        return None
+    return (np.min([b[0] for b in boxes], axis=0),
+            np.max([b[1] for b in boxes], axis=0))
+
+def fingerprint(obj):
+    """
+    Cheap signature of obj's transform and topology size, used to catch
+    changes the depsgraph handler did not see (e.g. undo)
+    """
+    counts = (len(obj.data.vertices), len(obj.data.polygons)) if obj.type == 'MESH' else ()
+    return counts + tuple(v for row in obj.matrix_world for v in row)
+
+def geometry_version(obj):
+    """
+    Signature that changes whenever obj's geometry or transform does,
+    including edits that keep the vertex and face counts
+    """
+    mesh_uid = obj.data.session_uid if obj.data is not None else None
+    return fingerprint(obj) + (_versions.get(obj.session_uid, 0), _versions.get(mesh_uid, 0))
+
+def cached_bounds(obj):
+    """
+    World space box of obj, only recomputed if obj or its mesh has changed
+    """
+    mesh_uid = obj.data.session_uid if obj.data is not None else None
+    fp = fingerprint(obj)
+    entry = _bounds_cache.get(obj.session_uid)
+    if entry is not None and entry[0] == mesh_uid and entry[1] == fp:
+        return entry[2]
+    bounds = object_bounds(obj)
+    _bounds_cache[obj.session_uid] = (mesh_uid, fp, bounds)
+    return bounds
+
+def forget(obj):
+    """
+    Drop obj from the bounds cache
+    """
+    _bounds_cache.pop(obj.session_uid, None)
+
+def clear_cache():
+    _bounds_cache.clear()
+    _versions.clear()
+
+def instruments_bounds(objects):
+    """
+    World space bounding box of a group of objects, no objects are created
+    and the selection is left alone
+    Per object boxes come from the cache so this is O(objects) unless
+    something has changed
+    """
+    return merge_bounds([cached_bounds(o) for o in objects if o is not None])
+
+@persistent
+def depsgraph_update(scene, depsgraph):
+    """
+    Evict cached boxes of objects whose geometry or transform changed,
+    and count the change for geometry_version
+    """
+    for update in depsgraph.updates:
+        id = update.id.original
+        if isinstance(id, bpy.types.Object):
+            if update.is_updated_geometry or update.is_updated_transform:
+                _versions[id.session_uid] = _versions.get(id.session_uid, 0) + 1
+                _bounds_cache.pop(id.session_uid, None)
+        elif isinstance(id, bpy.types.Mesh):
+            _versions[id.session_uid] = _versions.get(id.session_uid, 0) + 1
+            stale = [k for k, v in _bounds_cache.items() if v[0] == id.session_uid]
+            for k in stale:
+                del _bounds_cache[k]
+
+@persistent
+def load_post(*args):
+    clear_cache()
+
+def register_handlers():
+    bpy.app.handlers.depsgraph_update_post.append(depsgraph_update)
+    bpy.app.handlers.load_post.append(load_post)
+
+def unregister_handlers():
+    for handlers, f in ((bpy.app.handlers.depsgraph_update_post, depsgraph_update),
+                        (bpy.app.handlers.load_post, load_post)):
+        if f in handlers:
+            handlers.remove(f)
+    clear_cache()
+
+registration_list = []
@@ -5,20 +5,28 @@ import bpy
 from bpy.types import PropertyGroup
 from bpy.props import FloatProperty
 
-def screw_diam_update(self, context):
-    context.scene.support_props.screw_diam = context.scene.fittings_props.screw_diam
+from .deferred import schedule
 
-def screw_length_update(self, context):
-    context.scene.support_props.screw_length = context.scene.fittings_props.screw_length
+# fittings changed since they were last copied, keyed by scene name
+_changed = {}
 
-def nut_diam_update(self, context):
-    context.scene.support_props.nut_diam = context.scene.fittings_props.nut_diam
+def sync_fittings(scene, geometry=False):
+    """
+    Copy the fittings changed since the last sync to the support defaults
+    in one go, so defaults edited by hand are only overwritten by a change
+    to the same fitting
+    """
+    for p in sorted(_changed.pop(scene.name, ())):
+        setattr(scene.support_props, p, getattr(scene.fittings_props, p))
 
-def washer_diam_update(self, context):
-    context.scene.support_props.washer_diam = context.scene.fittings_props.washer_diam
-
-def washer_depth_update(self, context):
-    context.scene.support_props.washer_depth = context.scene.fittings_props.washer_depth
+def fittings_update(name):
+    """
+    Update callback for fitting name, queues it to be copied
+    """
+    def update(self, context):
+        _changed.setdefault(context.scene.name, set()).add(name)
+        schedule(context.scene, "fittings", sync_fittings)
+    return update
 
 class FittingsProperties(PropertyGroup):
 
@@ -27,31 +35,31 @@ class FittingsProperties(PropertyGroup):
                              min=0.003,
                              default=0.0048,
                              unit='LENGTH',
-                             update=screw_diam_update)
+                             update=fittings_update("screw_diam"))
     screw_length: FloatProperty(name="Screw length",
                              description="Length of the screw shaft",
                              min=0.016,
                              default=0.016,
                              unit='LENGTH',
-                             update=screw_length_update)
+                             update=fittings_update("screw_length"))
     nut_diam: FloatProperty(name="Nut diameter",
                              description="Diameter of the nut across corners",
                              min=0.006,
                              default=0.00882,
                              unit='LENGTH',
-                             update=nut_diam_update)
+                             update=fittings_update("nut_diam"))
     washer_diam: FloatProperty(name="Washer diameter",
                              description="Diameter of washer",
                              min=0.006,
                              default=0.00982,
                              unit='LENGTH',
-                             update=washer_diam_update)
+                             update=fittings_update("washer_diam"))
     washer_depth: FloatProperty(name="Washer depth",
                              description="Thickness of washer",
                              min=0.0005,
                              default=0.00095,
                              unit='LENGTH',
-                             update=washer_depth_update)
+                             update=fittings_update("washer_depth"))
 
 registration_list = (FittingsProperties,)
 fittings_props_list = ("screw_diam", "screw_length", "nut_diam", "washer_diam", "washer_depth")
@@ -0,0 +1,630 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026 DTRabbit
+
+import bpy
+import bmesh
+import numpy as np
+
+from bpy.app.handlers import persistent
+from math import pi
+from time import perf_counter
+from types import SimpleNamespace
+from mathutils import Matrix, Vector
+
+from .utils import X, Y, Z, BooleanPlan, parts_collection
+from .extents import geometry_version
+from .profiling import stage
+from .proxy import proxy_voxel_size, instrument_proxy
+from .support_props import support_props_list
+from .meshops import (Scratch,
+                      Slab,
+                      mesh_arrays,
+                      mesh_from_arrays,
+                      mesh_coords,
+                      mesh_edges,
+                      mesh_loops,
+                      mesh_dimensions,
+                      weld_seams,
+                      largest_parts,
+                      bevel_edges)
+
+# Operator free support generation
+# All geometry is built in a 'station frame' centred on the instrument axis
+# at the support position. Lid supports are built in a frame rotated 180
+# degrees about X, so they go through exactly the same steps as base supports.
+
+TOLERANCE = 0.0001
+# how far the instrument slab extends past each side of a support
+SLAB_MARGIN = 0.002
+# share of the instrument's faces a preview keeps, at full preview detail
+PREVIEW_RATIO = 0.25
+
+def support_values(s_props, m_props):
+    """
+    Support and materials properties as plain numbers
+    """
+    s = SimpleNamespace(**{p: getattr(s_props, p) for p in support_props_list + ("position",)})
+    s.l_sec_thickness = m_props.l_sec_thickness
+    s.int_ply_thickness = m_props.int_ply_thickness
+    s.preview = False
+    s.detail = 1.0
+    return s
+
+def support_spec(instrument, support_item, orientation, c_props, m_props, preview=False, detail=1.0):
+    """
+    Snapshot of everything needed to build one support, as plain numbers
+    A preview has no bevels, and curves get detail times their usual segments
+    """
+    s = support_values(support_item.support_props, m_props)
+    s.name = support_item.name
+    s.instrument = instrument.name
+    s.instrument_version = geometry_version(instrument)
+    s.proxy_voxel = proxy_voxel_size(c_props.clearance, s.thickness) if c_props.use_proxy else 0.0
+    s.preview = preview
+    s.detail = detail
+    s.orientation = orientation
+    loc = instrument.matrix_world.translation
+    # distance from instrument axis to bottom or top of case
+    s.axis_to_base_Z = loc[Z] - c_props.base_Z if orientation == 'BASE' \
+                                               else abs(c_props.lid_Z - loc[Z])
+    s.origin = (loc[X] + s.position, loc[Y], loc[Z])
+    return s
+
+def segments(s, vertices):
+    return max(8, int(vertices * s.detail))
+
+def frame_matrix(s):
+    """
+    Station frame to world space
+    """
+    m = Matrix.Translation(s.origin)
+    if s.orientation == 'LID':
+        m = m @ Matrix.Rotation(pi, 4, 'X')
+    return m
+
+def flange_thickness(s):
+    t = s.screw_length - (s.l_sec_thickness - 0.001) - s.washer_depth - s.int_ply_thickness
+    return s.flange_dim_Z if t < s.flange_dim_Z else t
+
+def flange_dims(s, support_dim_Y):
+    """
+    Thickness, radius and centre (Z) of the flange in the station frame
+    """
+    flange_ext_Y = max(s.flange_extension, s.washer_diam * 2)
+    flange_ext_X = s.slot_length + s.screw_diam + s.washer_diam + 0.002
+    flange_dim_Y = support_dim_Y + 2 * flange_ext_Y
+    flange_dim_X = s.support_dim_X + 2 * flange_ext_X
+    flange_dim_Z = flange_thickness(s)
+    flange_radius = max(flange_dim_X, flange_dim_Y) / 2
+    flange_loc_Z = -s.axis_to_base_Z + (flange_dim_Z / 2)
+    return flange_dim_Z, flange_radius, flange_loc_Z
+
+def fastener_locations(s, support_dim_Y, flange_radius):
+    """
+    Centres (X, Y) of the four screw slots / nuts in the station frame
+    """
+    slot_dim_X = s.slot_length + s.washer_diam + 0.002
+    locations = []
+    for pos in [1, -1]:
+        locations.append((-pos * flange_radius + pos * (slot_dim_X / 2 + 0.005), 0))
+        locations.append((0, pos * ((support_dim_Y / 2) + s.washer_diam)))
+    return locations
+
+def slot_cutter(scratch, location, s, flange_dim_Z):
+    # slot width is 0.5mm wider than screw diameter
+    slot_dim_Y = s.screw_diam * 1.1
+    slot_dim_Z = flange_dim_Z + 0.01
+    slot = scratch.block("SLOT", location, (s.slot_length, slot_dim_Y, slot_dim_Z))
+    for end in (-1, 1):
+        scratch.boolean(slot, 'UNION',
+                        scratch.cylinder("SLOT_END", Vector((end * s.slot_length / 2, 0, 0)) + location,
+                                         slot_dim_Y / 2, slot_dim_Z, vertices=segments(s, 32)))
+    return slot
+
+def nut_washer_cutter(scratch, location, s):
+    flange_top = location[Z] + s.l_sec_thickness / 2
+    washer_loc = (location[X], location[Y], flange_top - s.washer_depth / 2)
+    nut = scratch.cylinder("NUT", location, (s.nut_diam * 1.1) / 2,
+                           s.l_sec_thickness * 1.1, vertices=6)
+    scratch.boolean(nut, 'UNION',
+                    scratch.cylinder("WASHER", washer_loc, (s.washer_diam * 1.1) / 2,
+                                     s.washer_depth + 0.0001, vertices=segments(s, 64)))
+    return nut
+
+# fastener cutters, (slot, nut) as mesh arrays centred on the origin, keyed by
+# fastener_key, so each distinct fastener is only built once
+_cutter_templates = {}
+
+def fastener_key(s):
+    return tuple(round(v, 6) for v in (s.screw_diam, s.slot_length, flange_thickness(s),
+                                       s.nut_diam, s.washer_diam, s.washer_depth,
+                                       s.l_sec_thickness, s.detail))
+
+def cutter_templates(scratch, s):
+    """
+    Slot and nut cutters for the fasteners of s, built on first use
+    """
+    key = fastener_key(s)
+    if key not in _cutter_templates:
+        origin = Vector((0, 0, 0))
+        _cutter_templates[key] = (mesh_arrays(slot_cutter(scratch, origin, s, flange_thickness(s))),
+                                  mesh_arrays(nut_washer_cutter(scratch, origin, s)))
+    return _cutter_templates[key]
+
+def place_cutter(scratch, name, template, location):
+    """
+    Temporary mesh copy of a cutter template moved to location
+    """
+    co, loop_start, loop_verts = template
+    return mesh_from_arrays(scratch.mesh(name), co + np.array(location, dtype=np.float32),
+                            loop_start, loop_verts)
+
+def prune_templates(scene):
+    """
+    Drop cutter templates no support in scene uses any more
+    """
+    m_props = scene.materials_props
+    keys = {fastener_key(support_values(support_item.support_props, m_props))
+            for instr_item in scene.case_props.instrument_list
+            for support_item in instr_item.support_list}
+    for key in [k for k in _cutter_templates if k not in keys]:
+        del _cutter_templates[key]
+
+def support_bevel_edges(mesh, s, support_dim_Y, flange_dim_Z, center):
+    """
+    Indices of the edges at the top corners of the holder and round the top
+    of the flange
+    center: holder centre in the coordinates of mesh
+    """
+    co = mesh_coords(mesh) - np.array(center, dtype=np.float32)
+    edges = mesh_edges(mesh)
+    ref_corner = (s.support_dim_X / 2, support_dim_Y / 2, (s.axis_to_base_Z / 2) - (s.separation / 2))
+    flange_top_Z = -((s.axis_to_base_Z / 2) - flange_dim_Z)
+    # edges touching a top corner
+    corner = np.isclose(np.abs(co), ref_corner, atol=TOLERANCE).all(axis=1)
+    selected = corner[edges].any(axis=1)
+    # edges lying on top of the flange, the circle segments and where the holder meets it
+    flange_top = np.isclose(co[edges, Z], flange_top_Z, atol=TOLERANCE).all(axis=1)
+    if flange_top.any():
+        lengths = np.linalg.norm(co[edges[:, 0]] - co[edges[:, 1]], axis=1)
+        shortest = lengths[flange_top].min()
+        selected |= flange_top & (np.isclose(lengths, shortest, atol=TOLERANCE) |
+                                  np.isclose(lengths, s.support_dim_X, atol=TOLERANCE) |
+                                  np.isclose(lengths, support_dim_Y, atol=TOLERANCE))
+    return np.flatnonzero(selected)
+
+def pad_bevel_edges(mesh, s):
+    """
+    Indices of the edges round the inside of the pad, where the end faces and
+    the cut face meet the surface that faces the instrument, and where the
+    end faces meet the cut face
+    mesh is centred on the instrument axis
+    """
+    co = mesh_coords(mesh)
+    if len(co) == 0:
+        return np.empty(0, dtype=np.int64)
+    loop_start, loop_verts, loop_edges = mesh_loops(mesh)
+    loop_face = np.repeat(np.arange(len(loop_start)), np.diff(np.append(loop_start, len(loop_verts))))
+    # faces lying in an end face or the cut face of the gap
+    x = co[loop_verts, X]
+    in_plane = lambda mask: np.minimum.reduceat(mask.astype(np.uint8), loop_start).astype(bool)
+    plane = in_plane(np.isclose(x, x.max(), atol=TOLERANCE)) | \
+            in_plane(np.isclose(x, x.min(), atol=TOLERANCE)) | \
+            in_plane(np.isclose(np.abs(co[loop_verts, Z]), s.separation / 2, atol=TOLERANCE))
+    # faces that face the instrument, their normals point at the axis
+    normal = np.empty(len(loop_start) * 3, dtype=np.float32)
+    mesh.polygons.foreach_get("normal", normal)
+    center = np.empty(len(loop_start) * 3, dtype=np.float32)
+    mesh.polygons.foreach_get("center", center)
+    normal = normal.reshape(-1, 3)
+    center = center.reshape(-1, 3)
+    inward = (normal[:, Y] * center[:, Y] + normal[:, Z] * center[:, Z]) < 0
+    # edges between the two
+    count = lambda faces: np.bincount(loop_edges, weights=faces[loop_face], minlength=len(mesh.edges)) > 0
+    selected = count(plane) & count(~plane & inward)
+    # edges across the cut face at either end
+    edges = mesh_edges(mesh)
+    cut = np.isclose(np.abs(co[edges, Z]), s.separation / 2, atol=TOLERANCE).all(axis=1)
+    end = np.isclose(co[edges, X], x.max(), atol=TOLERANCE).all(axis=1) | \
+          np.isclose(co[edges, X], x.min(), atol=TOLERANCE).all(axis=1)
+    return np.flatnonzero(selected | (cut & end))
+
+def bevel_mesh(mesh, edge_indices):
+    """
+    Bevel the edges of mesh given by index, no edit mode needed
+    mesh is left unbevelled, and False returned, if the bevel would make it
+    non-manifold
+    """
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    bm.edges.ensure_lookup_table()
+    bevel_edges(bm, [bm.edges[i] for i in edge_indices])
+    # corners cut by the instrument can leave edges shorter than the bevel
+    # offset, the bevel then folds over itself and later booleans would fail
+    manifold = all(e.is_manifold for e in bm.edges)
+    if manifold:
+        bm.to_mesh(mesh)
+        mesh.update()
+    bm.free()
+    return manifold
+
+def build_pad_shell(scratch, instrument, s):
+    """
+    Section of instrument at support s, scaled to allow pad thickness, with
+    the instrument cut from its centre
+    instrument is a mesh in the base station frame, the result is a full ring
+    in the same frame and is the same for base and lid supports
+    """
+    shell = scratch.block("Shell", (0, 0, 0), (s.support_dim_X, 1, 1))
+    scratch.boolean(shell, 'INTERSECT', instrument)
+    dims = mesh_dimensions(shell)
+    pad_scale = 1 + (2 * s.thickness / min(dims[Y], dims[Z]))
+    shell.transform(Matrix.Diagonal((1, pad_scale, pad_scale, 1)))
+    scratch.boolean(shell, 'DIFFERENCE', instrument)
+    return shell
+
+def instrument_slab(scratch, slab, s):
+    """
+    The slice of the instrument a support at s can touch, as a closed mesh in
+    the base station frame, so boolean cost follows the slice and not the
+    whole instrument
+    """
+    half = s.support_dim_X / 2 + SLAB_MARGIN
+    mesh = scratch.slab("Instrument", slab, s.origin[X] - half, s.origin[X] + half)
+    mesh.transform(Matrix.Translation(s.origin).inverted())
+    return mesh
+
+def shell_key(instrument, s):
+    """
+    Supports with the same key share a pad shell
+    """
+    return (instrument.name, round(s.position, 6), round(s.support_dim_X, 6), round(s.thickness, 6))
+
+def station_pad(scratch, shell, s):
+    """
+    Copy of a base frame pad shell in the frame of support s, lid supports
+    get it turned over with a matrix rather than rebuilding it
+    """
+    pad = scratch.copy(shell, s.name + "P")
+    if s.orientation == 'LID':
+        pad.transform(Matrix.Rotation(pi, 4, 'X'))
+    return pad
+
+def station_planes(s, support_dim_Y):
+    """
+    (axis, value) planes of the support block and gap in the station frame,
+    where the booleans leave their seams
+    """
+    return [(X, s.support_dim_X / 2), (X, -s.support_dim_X / 2),
+            (Y, support_dim_Y / 2), (Y, -support_dim_Y / 2),
+            (Z, s.separation / 2), (Z, -s.separation / 2),
+            (Z, 0), (Z, -s.axis_to_base_Z)]
+
+# Support stages
+# A support is built by a chain of named stages. Each stage declares the
+# stages it uses and the spec fields it depends on, its outputs are stored as
+# arrays keyed by a signature of both, so an edit only re-runs the stages
+# downstream of the fields that changed, and supports whose early stages
+# match (base and lid at one station) share them.
+
+def stage_section(scratch, s, inputs, section):
+    return {"instrument": section(s)}
+
+def stage_pad_shell(scratch, s, inputs, section):
+    return {"shell": build_pad_shell(scratch, inputs["section"]["instrument"], s)}
+
+def stage_support_block(scratch, s, inputs, section):
+    # support block, pad trimmed to it and cut out of it
+    pad = station_pad(scratch, inputs["pad_shell"]["shell"], s)
+    support_dim_Y = mesh_dimensions(pad)[Y] + 2 * (s.thickness + s.extension)
+    support = scratch.block("Support_temp", (0, 0, -s.axis_to_base_Z / 2),
+                            (s.support_dim_X, support_dim_Y, s.axis_to_base_Z))
+    scratch.boolean(pad, 'INTERSECT', support)
+    scratch.boolean(support, 'DIFFERENCE', pad)
+    return {"support": support, "pad": pad, "support_dim_Y": support_dim_Y}
+
+def stage_gap_cut(scratch, s, inputs, section):
+    # separation gap
+    block = inputs["support_block"]
+    gap = scratch.block("Gap", (0, 0, 0), (1, 1, s.separation))
+    scratch.boolean(block["support"], 'DIFFERENCE', gap)
+    scratch.boolean(block["pad"], 'DIFFERENCE', gap)
+    return {"support": block["support"], "pad": block["pad"]}
+
+def stage_split(scratch, s, inputs, section):
+    # clean up along the seams and identify parts by volume
+    support, pad = inputs["gap_cut"]["support"], inputs["gap_cut"]["pad"]
+    support_dim_Y = inputs["support_block"]["support_dim_Y"]
+    seams = station_planes(s, support_dim_Y)
+    weld_seams(support, seams)
+    weld_seams(pad, seams)
+    try:
+        holder, clamp = largest_parts(support, ("holder", "clamp"), new_mesh=scratch.mesh)
+    except ValueError:
+        raise RuntimeError(s.name + ": support did not separate into holder and clamp")
+    return {"holder": holder, "clamp": clamp, "pad": pad}
+
+def stage_flange(scratch, s, inputs, section):
+    holder = inputs["split"]["holder"]
+    flange_dim_Z, flange_radius, flange_loc_Z = flange_dims(s, inputs["support_block"]["support_dim_Y"])
+    scratch.boolean(holder, 'UNION',
+                    scratch.cylinder("FLANGE", (0, 0, flange_loc_Z), flange_radius, flange_dim_Z,
+                                     vertices=segments(s, 64)))
+    weld_seams(holder, [(Z, flange_loc_Z + flange_dim_Z / 2)])
+    return {"holder": holder}
+
+def stage_bevel(scratch, s, inputs, section):
+    holder, pad = inputs["flange"]["holder"], inputs["split"]["pad"]
+    if not s.preview:
+        support_dim_Y = inputs["support_block"]["support_dim_Y"]
+        with stage("bevel selection"):
+            holder_edges = support_bevel_edges(holder, s, support_dim_Y, flange_thickness(s),
+                                               (0, 0, -s.axis_to_base_Z / 2))
+            pad_edges = pad_bevel_edges(pad, s)
+        bevel_mesh(holder, holder_edges)
+        bevel_mesh(pad, pad_edges)
+    return {"holder": holder, "pad": pad}
+
+def stage_nut_plate(scratch, s, inputs, section):
+    flange_dim_Z, flange_radius, flange_loc_Z = flange_dims(s, inputs["support_block"]["support_dim_Y"])
+    nut_plate_loc_Z = flange_loc_Z - flange_dim_Z - s.int_ply_thickness
+    nut_plate = scratch.cylinder("nut_plate", (0, 0, nut_plate_loc_Z), flange_radius,
+                                 s.l_sec_thickness, vertices=segments(s, 64))
+    return {"nut_plate": nut_plate, "loc_Z": nut_plate_loc_Z}
+
+def stage_fastener_cuts(scratch, s, inputs, section):
+    # screw slots in the flange and nut holes in the nut plate
+    holder, nut_plate = inputs["bevel"]["holder"], inputs["nut_plate"]["nut_plate"]
+    support_dim_Y = inputs["support_block"]["support_dim_Y"]
+    flange_dim_Z, flange_radius, flange_loc_Z = flange_dims(s, support_dim_Y)
+    nut_plate_loc_Z = inputs["nut_plate"]["loc_Z"]
+    # all slots go in one solver pass, as do all nut holes
+    slot, nut = cutter_templates(scratch, s)
+    plan = BooleanPlan()
+    for loc_X, loc_Y in fastener_locations(s, support_dim_Y, flange_radius):
+        plan.add(holder, 'DIFFERENCE', place_cutter(scratch, "SLOT", slot, (loc_X, loc_Y, flange_loc_Z)))
+        plan.add(nut_plate, 'DIFFERENCE', place_cutter(scratch, "NUT", nut, (loc_X, loc_Y, nut_plate_loc_Z)))
+    plan.execute(scratch.boolean)
+    return {"holder": holder, "nut_plate": nut_plate}
+
+FLANGE_FIELDS = ("support_dim_X", "axis_to_base_Z", "flange_extension", "flange_dim_Z",
+                 "screw_diam", "screw_length", "washer_diam", "washer_depth", "slot_length",
+                 "l_sec_thickness", "int_ply_thickness", "detail")
+
+# (name, stages used, spec fields, function) in build order
+STAGES = (("section", (), ("instrument", "instrument_version", "proxy_voxel", "origin",
+                           "support_dim_X", "preview", "detail"), stage_section),
+          ("pad_shell", ("section",), ("thickness",), stage_pad_shell),
+          ("support_block", ("pad_shell",), ("orientation", "axis_to_base_Z", "extension"),
+           stage_support_block),
+          ("gap_cut", ("support_block",), ("separation",), stage_gap_cut),
+          ("split", ("gap_cut", "support_block"), (), stage_split),
+          ("flange", ("split", "support_block"), FLANGE_FIELDS, stage_flange),
+          ("bevel", ("flange", "split", "support_block"), ("preview",), stage_bevel),
+          ("nut_plate", ("support_block",), FLANGE_FIELDS, stage_nut_plate),
+          ("fastener_cuts", ("bevel", "nut_plate", "support_block"), FLANGE_FIELDS + ("nut_diam",),
+           stage_fastener_cuts))
+
+# stage outputs keyed by stage signature, meshes are held as mesh arrays
+_stage_store = {}
+# support name to {stage name: signature} of its last build
+_support_stages = {}
+# the same for previews, kept apart so they never push out full quality outputs
+_preview_store = {}
+_preview_stages = {}
+
+def freeze(value):
+    return tuple(freeze(v) for v in value) if isinstance(value, (list, tuple)) else value
+
+def pack(outputs):
+    return {k: ("mesh", mesh_arrays(v)) if isinstance(v, bpy.types.Mesh) else ("value", v)
+            for k, v in outputs.items()}
+
+def unpack(scratch, packed):
+    """
+    Stage outputs with each mesh as a new temporary mesh, so the stage using
+    them is free to change them
+    """
+    return {k: mesh_from_arrays(scratch.mesh(k), *v) if kind == "mesh" else v
+            for k, (kind, v) in packed.items()}
+
+def run_stages(scratch, s, section, store=None):
+    """
+    Run the stages of support s that store has no outputs for
+    section(s): the instrument slab for s, only called if the section has
+    to be rebuilt
+    Returns {stage name: signature}, the outputs are in store
+    """
+    store = _stage_store if store is None else store
+    signatures = {}
+    for name, uses, fields, function in STAGES:
+        signature = (name, freeze([getattr(s, f) for f in fields]), tuple(signatures[u] for u in uses))
+        signatures[name] = signature
+        with stage(name, cached=signature in store):
+            if signature not in store:
+                mark = scratch.mark()
+                inputs = {u: unpack(scratch, store[signatures[u]]) for u in uses}
+                store[signature] = pack(function(scratch, s, inputs, section))
+                scratch.release(mark)
+    return signatures
+
+def stage_parts(scratch, s, signatures, store=None):
+    """
+    Holder, pad, clamp and nut plate of a support from its stage outputs
+    Returns {suffix: (mesh, origin)} with every mesh in the station frame
+    """
+    store = _stage_store if store is None else store
+    output = lambda stage, key: unpack(scratch, {key: store[signatures[stage]][key]})[key]
+    support_center = Vector((0, 0, -s.axis_to_base_Z / 2))
+    return {"H": (output("fastener_cuts", "holder"), support_center),
+            "P": (output("bevel", "pad"), Vector((0, 0, 0))),
+            "C": (output("split", "clamp"), support_center),
+            "N": (output("fastener_cuts", "nut_plate"),
+                  Vector((0, 0, store[signatures["nut_plate"]]["loc_Z"][1])))}
+
+def build_parts(scratch, s, section, store=None):
+    """
+    Build holder, pad, clamp and nut plate for support s
+    store: where stage outputs are kept, by default the shared cache for
+    full quality or preview builds
+    Returns {suffix: (mesh, origin)} with every mesh still in the station frame
+    """
+    if store is None:
+        store, built = (_preview_store, _preview_stages) if s.preview else (_stage_store, _support_stages)
+        built[s.name] = run_stages(scratch, s, section, store)
+        return stage_parts(scratch, s, built[s.name], store)
+    return stage_parts(scratch, s, run_stages(scratch, s, section, store), store)
+
+def prune_stages(scene):
+    """
+    Drop stage outputs no support in scene was last built from
+    """
+    names = {support_item.name for instr_item in scene.case_props.instrument_list
+                               for support_item in instr_item.support_list}
+    for store, built in ((_stage_store, _support_stages), (_preview_store, _preview_stages)):
+        for name in [n for n in built if n not in names]:
+            del built[name]
+        used = {sig for signatures in built.values() for sig in signatures.values()}
+        for signature in [k for k in store if k not in used]:
+            del store[signature]
+
+def clear_stages():
+    for cache in (_stage_store, _support_stages, _preview_store, _preview_stages):
+        cache.clear()
+
+@persistent
+def load_post(*args):
+    clear_stages()
+
+def register_handlers():
+    bpy.app.handlers.load_post.append(load_post)
+
+def unregister_handlers():
+    if load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(load_post)
+    clear_stages()
+
+def link_parts(parts, s, collection):
+    """
+    Turn the station frame meshes into objects in collection
+    """
+    frame = frame_matrix(s)
+    objects = {}
+    for suffix, (mesh, origin) in parts.items():
+        origin = Vector(origin)
+        mesh.name = s.name + suffix
+        mesh.transform(Matrix.Translation(-origin))
+        obj = bpy.data.objects.new(s.name + suffix, mesh)
+        obj.matrix_world = frame @ Matrix.Translation(origin)
+        collection.objects.link(obj)
+        objects[suffix] = obj
+    return objects
+
+def assign_parts(support_item, objects, orientation):
+    support_item.support = objects["H"]
+    support_item.pad = objects["P"]
+    support_item.clamp = objects["C"]
+    support_item.nut_plate = objects["N"]
+    support_item.orientation = orientation
+
+def slab_key(instrument, s):
+    """
+    Supports with the same key crop their instrument slabs from one Slab
+    """
+    return (instrument.name, s.proxy_voxel)
+
+def instrument_slab_source(scratch, instrument, depsgraph, s):
+    """
+    Slab of instrument to crop support slabs from, the instrument's proxy
+    if s uses one, previews get a coarser proxy or a decimated copy
+    """
+    if s.proxy_voxel > 0:
+        # about PREVIEW_RATIO * detail of the faces, which go as 1 / voxel size squared
+        scale = (PREVIEW_RATIO * s.detail) ** -0.5 if s.preview else 1.0
+        return instrument_proxy(instrument, depsgraph, s.proxy_voxel * scale, scratch)
+    mesh = scratch.from_object(instrument, depsgraph)
+    if s.preview:
+        scratch.modify(mesh, 'DECIMATE', ratio=PREVIEW_RATIO * s.detail, use_collapse_triangulate=True)
+    return Slab(mesh)
+
+def build_supports(scene, depsgraph, jobs, collection=None, slabs=None, preview=False, detail=1.0):
+    """
+    Build a batch of supports without operators or a context
+    jobs: (instrument list item, support list item, orientation) tuples
+    collection: where the parts go, by default each instrument's parts
+    collection
+    slabs: slab_key to Slab, filled in with any that are missing so the
+    caller can reuse them
+    Supports are built through the stage cache, so only stages whose inputs
+    changed since the last build run, each instrument is evaluated at most
+    once, and base and lid supports at the same station share one pad shell
+    A failed support is reported and the rest carry on
+    Returns a list of (support name, seconds, error or None)
+    """
+    c_props = scene.case_props
+    m_props = scene.materials_props
+    slabs = {} if slabs is None else slabs
+    report = []
+    if not preview:
+        prune_templates(scene)
+    with Scratch() as scratch:
+        for instr_item, support_item, orientation in jobs:
+            start = perf_counter()
+            mark = scratch.mark()
+            try:
+                instrument = instr_item.instr
+                s = support_spec(instrument, support_item, orientation, c_props, m_props, preview, detail)
+
+                def section(s):
+                    # instrument geometry, shared between supports
+                    key = slab_key(instrument, s)
+                    if key not in slabs:
+                        with stage("instrument slab"):
+                            slabs[key] = instrument_slab_source(scratch, instrument, depsgraph, s)
+                    return instrument_slab(scratch, slabs[key], s)
+
+                with stage(support_item.name, orientation=orientation):
+                    parts = build_parts(scratch, s, section)
+                    parts = {k: (scratch.keep(mesh), origin) for k, (mesh, origin) in parts.items()}
+                    assign_parts(support_item,
+                                 link_parts(parts, s, collection or parts_collection(scene, instr_item)),
+                                 orientation)
+                error = None
+            except Exception as e:
+                error = str(e)
+            scratch.release(mark)
+            report.append((support_item.name, perf_counter() - start, error))
+    prune_stages(scene)
+    return report
+
+def scene_depsgraph(scene):
+    """
+    Depsgraph of scene for when there is no operator context, e.g. in timers
+    or background scripts
+    """
+    view_layer = bpy.context.view_layer if bpy.context.scene == scene else scene.view_layers[0]
+    # the view layer's depsgraph is None until one is asked for, and may not
+    # have been evaluated since objects were added or moved
+    with bpy.context.temp_override(scene=scene, view_layer=view_layer):
+        return bpy.context.evaluated_depsgraph_get()
+
+def generate_supports(context, jobs, collection=None):
+    """
+    build_supports for the context's scene, parts go to collection or their
+    instrument's parts collection
+    """
+    return build_supports(context.scene, context.evaluated_depsgraph_get(), jobs, collection)
+
+def generate_support(context, instr_item, support_item, orientation, collection=None):
+    """
+    Build support_item for instr_item without operators
+    Only the finished objects are linked, to collection or the instrument's
+    parts collection
+    """
+    name, seconds, error = generate_supports(context, [(instr_item, support_item, orientation)],
+                                             collection)[0]
+    if error is not None:
+        raise RuntimeError(error)
+    return seconds
+
+registration_list = []
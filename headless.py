@@ -0,0 +1,199 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026 DTRabbit
+
+import bpy
+import json
+import os
+
+from time import perf_counter
+
+from . import deferred
+from .utils import update_case, forget_lists
+from .support_props import support_props_list
+from .materials_props import materials_props_list
+from .fittings_props import fittings_props_list, sync_fittings
+from .support_list import new_support
+from .generator import build_supports, scene_depsgraph
+from .parallel import build_supports_parallel
+from .export import export_parts
+
+# Batch generation without the UI, from a JSON job spec, e.g.
+#   {"blend": "in.blend",                        (optional, else the open file)
+#    "scene": "Scene",                            (optional)
+#    "clearance": 0.01,
+#    "materials": {"l_sec_thickness": 0.005},
+#    "fittings": {"screw_diam": 0.0048},
+#    "supports": {"thickness": 0.006},           (support defaults)
+#    "workers": 0,
+#    "collection": "Supports",                    (optional, else one per instrument)
+#    "instruments": [{"object": "Violin",
+#                     "stations": [{"position": 0.1, "orientation": "BOTH"}]},
+#                    {"file": "bell.stl", "name": "Bell", "location": [0, 0.3, 0],
+#                     "stations": [{"position": 0.05, "thickness": 0.008}]}],
+#    "save": "out.blend",
+#    "export": {"directory": "parts", "format": "STL", "scale": 1000},  (or "3MF")
+#    "report": "report.json"}
+# Paths are relative to the spec file. Run it with batch.py, or call run().
+
+# file extension to importer
+IMPORTERS = {".stl": lambda path: bpy.ops.wm.stl_import(filepath=path),
+             ".obj": lambda path: bpy.ops.wm.obj_import(filepath=path),
+             ".ply": lambda path: bpy.ops.wm.ply_import(filepath=path)}
+
+def load_spec(spec):
+    """
+    Spec as a dict and the directory its paths are relative to
+    """
+    if isinstance(spec, dict):
+        return spec, os.getcwd()
+    with open(spec) as f:
+        return json.load(f), os.path.dirname(os.path.abspath(spec))
+
+def set_props(props, values, names, what):
+    for name, value in values.items():
+        if name not in names:
+            raise ValueError("unknown {} setting '{}'".format(what, name))
+        setattr(props, name, value)
+
+def import_instrument(path, name=None):
+    """
+    Import the mesh in path and return its object
+    """
+    importer = IMPORTERS.get(os.path.splitext(path)[1].lower())
+    if importer is None:
+        raise ValueError("can't import " + path)
+    before = set(bpy.data.objects)
+    importer(path)
+    new = [o for o in bpy.data.objects if o not in before and o.type == 'MESH']
+    if len(new) == 0:
+        raise ValueError("no mesh in " + path)
+    if name is not None:
+        new[0].name = name
+    return new[0]
+
+def add_instrument(scene, entry, root):
+    """
+    Instrument list item for a spec entry, the object is looked up by name
+    or imported from a file
+    """
+    if "file" in entry:
+        obj = import_instrument(os.path.join(root, entry["file"]), entry.get("name"))
+    else:
+        obj = bpy.data.objects.get(entry["object"])
+        if obj is None:
+            raise ValueError("no object named '{}'".format(entry["object"]))
+    if "location" in entry:
+        obj.location = entry["location"]
+    c_props = scene.case_props
+    for item in c_props.instrument_list:
+        if item.instr == obj:
+            return item
+    c_props.instrument_list.add()
+    c_props.instrument_list[-1].instr = obj
+    c_props.instrument_list_index = len(c_props.instrument_list) - 1
+    forget_lists()
+    return c_props.instrument_list[-1]
+
+def add_stations(scene, instr_item, stations):
+    """
+    Support list items for the spec stations of an instrument
+    Returns {support name: orientation}
+    """
+    supports = {}
+    for station in stations:
+        station = dict(station)
+        orientation = station.pop("orientation", 'BASE')
+        orientations = ('BASE', 'LID') if orientation == 'BOTH' else (orientation,)
+        for o in orientations:
+            if o not in ('BASE', 'LID'):
+                raise ValueError("unknown orientation '{}'".format(o))
+            support_item = new_support(instr_item, scene.support_props)
+            set_props(support_item.support_props, station, support_props_list + ("position",), "support")
+            support_item.orientation = o
+            supports[support_item.name] = o
+    return supports
+
+def named_collection(scene, name):
+    if name is None:
+        return None
+    collection = bpy.data.collections.get(name)
+    if collection is None:
+        collection = bpy.data.collections.new(name)
+    if collection.name not in scene.collection.children:
+        scene.collection.children.link(collection)
+    return collection
+
+def run(spec):
+    """
+    Generate the supports in a job spec (a dict or a JSON file)
+    Returns the report as a dict, and writes it to the spec's report path
+    """
+    start = perf_counter()
+    spec, root = load_spec(spec)
+    report = {"supports": [], "errors": []}
+    if "blend" in spec:
+        bpy.ops.wm.open_mainfile(filepath=os.path.join(root, spec["blend"]))
+    scene = bpy.data.scenes[spec["scene"]] if "scene" in spec else bpy.context.scene
+    if not hasattr(scene, "case_props"):
+        raise RuntimeError("the Cases add-on is not registered")
+
+    c_props = scene.case_props
+    c_props.clearance = spec.get("clearance", c_props.clearance)
+    set_props(scene.materials_props, spec.get("materials", {}), materials_props_list, "materials")
+    set_props(scene.fittings_props, spec.get("fittings", {}), fittings_props_list, "fittings")
+    sync_fittings(scene)
+    set_props(scene.support_props, spec.get("supports", {}), support_props_list, "support")
+
+    wanted = {}
+    for entry in spec.get("instruments", []):
+        try:
+            instr_item = add_instrument(scene, entry, root)
+            wanted.update(add_stations(scene, instr_item, entry.get("stations", [])))
+        except Exception as e:
+            report["errors"].append({"instrument": entry.get("object", entry.get("file")), "error": str(e)})
+    # list items move as the lists grow, so only look them up once they are done
+    jobs = [(instr_item, support_item, wanted[support_item.name])
+            for instr_item in c_props.instrument_list
+            for support_item in instr_item.support_list
+            if support_item.name in wanted]
+    # placed and imported instruments only get their world matrices from a
+    # depsgraph update, which the case extents and the supports both read
+    depsgraph = scene_depsgraph(scene)
+    # nothing is left waiting for timers that never run in the background
+    deferred.flush()
+    update_case(scene)
+
+    collection = named_collection(scene, spec.get("collection"))
+    workers = spec.get("workers", 0)
+    if workers > 0:
+        results = build_supports_parallel(scene, depsgraph, jobs, workers, collection)
+    else:
+        results = build_supports(scene, depsgraph, jobs, collection)
+    # parallel results come back grouped by station, so match them up by name
+    supports = {support_item.name: (instr_item, o) for instr_item, support_item, o in jobs}
+    for name, seconds, error in results:
+        instr_item, o = supports[name]
+        report["supports"].append({"instrument": instr_item.instr.name, "name": name,
+                                   "orientation": o, "seconds": seconds, "error": error})
+
+    if "export" in spec:
+        export = spec["export"]
+        try:
+            report["files"] = export_parts(scene, os.path.join(root, export["directory"]),
+                                           export.get("format", 'STL'), export.get("scale", 1000.0),
+                                           export.get("filename", "supports"))
+        except Exception as e:
+            report["errors"].append({"export": export["directory"], "error": str(e)})
+    if "save" in spec:
+        try:
+            bpy.ops.wm.save_as_mainfile(filepath=os.path.join(root, spec["save"]))
+        except Exception as e:
+            report["errors"].append({"save": spec["save"], "error": str(e)})
+    report["seconds"] = perf_counter() - start
+    report["ok"] = len(report["errors"]) == 0 and all(s["error"] is None for s in report["supports"])
+    if "report" in spec:
+        with open(os.path.join(root, spec["report"]), "w") as f:
+            json.dump(report, f, indent=1)
+    return report
+
+registration_list = []
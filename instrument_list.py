@@ -1,12 +1,17 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # SPDX-FileCopyrightText: 2026 DTRabbit
 
-import bpy
-from bpy.types import PropertyGroup, UIList, Object, Operator
+from bpy.types import PropertyGroup, UIList, Object, Collection, Operator
 from bpy.props import PointerProperty, CollectionProperty, IntProperty
 
-from .utils import calc_case, current_instr_list_item
-from .support_list import SupportListItem
+from .utils import (calc_case,
+                    current_instr_list_item,
+                    remove_parts_collection,
+                    registered_instruments,
+                    forget_lists)
+from .extents import forget
+from . import proxy, sections
+from .support_list import SupportListItem, remove_all_parts
 
 class InstrumentListItem(PropertyGroup):
 
@@ -14,6 +19,7 @@ class InstrumentListItem(PropertyGroup):
     support_list: CollectionProperty(name="Support List", type=SupportListItem)
     support_list_index: IntProperty(name="Support List Index", default=-1)
     support_count: IntProperty(default=0)
+    parts: PointerProperty(name="Parts", description="Collection of the generated parts", type=Collection)
 
 class Instrument_UL_List(UIList):
 
@@ -33,12 +39,11 @@ class Instrument_LIST_OT_NewItem(Operator):
 
     @classmethod
     def poll(cls, context):
-        result = len(context.selected_objects) > 0
-        for item in context.scene.case_props.instrument_list:
-            if item.instr in context.selected_objects:
-                result = False
-                break
-        return result
+        selected = context.selected_objects
+        if len(selected) == 0:
+            return False
+        registered = registered_instruments(context.scene)
+        return not any(obj.session_uid in registered for obj in selected)
 
     def execute(self, context):
         c_props = context.scene.case_props
@@ -46,6 +51,7 @@ class Instrument_LIST_OT_NewItem(Operator):
             c_props.instrument_list.add()
             c_props.instrument_list[-1].instr = obj
             c_props.instrument_list_index = len(c_props.instrument_list) - 1
+        forget_lists()
         calc_case(self, context)
         return {'FINISHED'}
 
@@ -61,10 +67,17 @@ class Instrument_LIST_OT_DeleteItem(Operator):
     def execute(self,context):
         c_props = context.scene.case_props
         instrument_list = c_props.instrument_list
-        for support in current_instr_list_item(context).support_list:
-            bpy.ops.support_list.delete_item()
+        instr_item = current_instr_list_item(context)
+        remove_all_parts(instr_item.support_list)
+        instr_item.support_list.clear()
+        remove_parts_collection(instr_item)
         index = c_props.instrument_list_index
+        if instrument_list[index].instr is not None:
+            forget(instrument_list[index].instr)
+            proxy.forget(instrument_list[index].instr)
+            sections.forget(instrument_list[index].instr)
         instrument_list.remove(index)
+        forget_lists()
         c_props.instrument_list_index = min(max(0, index-1), len(instrument_list)-1)
         calc_case(self, context)
         return {'FINISHED'}
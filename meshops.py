@@ -0,0 +1,468 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026 DTRabbit
+
+import bpy
+import bmesh
+import numpy as np
+
+from mathutils import Matrix, Vector
+from mathutils.kdtree import KDTree
+
+from .profiling import stage, boolean
+
+# mesh building blocks that work purely on data, they never need a particular
+# mode, selection or active object
+
+SCRATCH_NAME = ".cases_scratch"
+# loose parts smaller than this (m^3) are slivers left by the booleans
+MIN_PART_VOLUME = 1e-8
+
+def bm_block(bm, center, dims):
+    """
+    Add a box of size dims centred on center to bm
+    """
+    bmesh.ops.create_cube(bm, size=1.0,
+                          matrix=Matrix.LocRotScale(Vector(center), None, Vector(dims)))
+    return bm
+
+def bm_cylinder(bm, center, radius, depth, vertices=32):
+    """
+    Add a Z aligned cylinder centred on center to bm
+    """
+    bmesh.ops.create_cone(bm, cap_ends=True, cap_tris=False, segments=vertices,
+                          radius1=radius, radius2=radius, depth=depth,
+                          matrix=Matrix.Translation(Vector(center)))
+    return bm
+
+def mesh_coords(mesh):
+    """
+    Vertex coordinates of mesh as an (n, 3) array
+    """
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    return co.reshape(-1, 3)
+
+def mesh_bounds(mesh):
+    """
+    (min, max) of mesh in its own space
+    """
+    co = mesh_coords(mesh)
+    if len(co) == 0:
+        return np.zeros(3), np.zeros(3)
+    return co.min(axis=0), co.max(axis=0)
+
+def mesh_dimensions(mesh):
+    lo, hi = mesh_bounds(mesh)
+    return hi - lo
+
+def mesh_bytes(mesh):
+    """
+    Rough size of mesh's geometry in memory: positions, edges, corners and
+    face offsets
+    """
+    return 12 * len(mesh.vertices) + 8 * len(mesh.edges) + 8 * len(mesh.loops) + 4 * len(mesh.polygons)
+
+def mesh_arrays(mesh):
+    """
+    (co, loop_start, loop_verts) arrays of mesh
+    """
+    loop_start = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_start)
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    return mesh_coords(mesh), loop_start, loop_verts
+
+def mesh_edges(mesh):
+    """
+    Vertex indices of the edges of mesh as an (n, 2) array
+    """
+    edges = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+    mesh.edges.foreach_get("vertices", edges)
+    return edges.reshape(-1, 2)
+
+def mesh_loops(mesh):
+    """
+    (loop_start, loop_verts, loop_edges) arrays of mesh
+    """
+    loop_start = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_start)
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    loop_edges = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("edge_index", loop_edges)
+    return loop_start, loop_verts, loop_edges
+
+def non_manifold_edges(mesh):
+    """
+    Indices of the edges of mesh not shared by exactly two faces
+    """
+    loop_edges = mesh_loops(mesh)[2]
+    return np.flatnonzero(np.bincount(loop_edges, minlength=len(mesh.edges)) != 2)
+
+def require_manifold(meshes, operation):
+    """
+    Raise a RuntimeError if any of meshes is not manifold
+    The manifold solver leaves the target unchanged on such inputs, with
+    only a modifier warning, so the boolean would be silently skipped
+    """
+    for mesh in meshes:
+        count = len(non_manifold_edges(mesh))
+        if count:
+            raise RuntimeError("boolean {}: {} has {} non-manifold edges".format(operation, mesh.name, count))
+
+def mesh_from_arrays(mesh, co, loop_start, loop_verts):
+    """
+    Replace the geometry of mesh with polygons given as arrays
+    """
+    mesh.clear_geometry()
+    mesh.vertices.add(len(co))
+    mesh.vertices.foreach_set("co", np.ascontiguousarray(co, dtype=np.float32).ravel())
+    mesh.loops.add(len(loop_verts))
+    mesh.loops.foreach_set("vertex_index", np.ascontiguousarray(loop_verts, dtype=np.int32))
+    mesh.polygons.add(len(loop_start))
+    mesh.polygons.foreach_set("loop_start", np.ascontiguousarray(loop_start, dtype=np.int32))
+    mesh.update(calc_edges=True)
+    return mesh
+
+def gather_faces(loop_start, loop_verts, keep):
+    """
+    Loop starts and vertex indices of the faces selected by mask keep
+    """
+    loop_total = np.diff(np.append(loop_start, len(loop_verts)))
+    starts = loop_start[keep]
+    totals = loop_total[keep]
+    new_start = np.cumsum(totals) - totals
+    index = np.arange(totals.sum()) - np.repeat(new_start, totals) + np.repeat(starts, totals)
+    return new_start, loop_verts[index]
+
+def cap_slab(mesh, lo, hi):
+    """
+    Cut mesh at X = lo and X = hi, keep what is between and close the cut
+    """
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    for x, normal in ((hi, (1, 0, 0)), (lo, (-1, 0, 0))):
+        cut = bmesh.ops.bisect_plane(bm, geom=bm.verts[:] + bm.edges[:] + bm.faces[:],
+                                     dist=0.00001, plane_co=(x, 0, 0), plane_no=normal,
+                                     clear_outer=True)
+        edges = [e for e in cut["geom_cut"] if isinstance(e, bmesh.types.BMEdge) and e.is_boundary]
+        if len(edges) > 0:
+            bmesh.ops.triangle_fill(bm, use_beauty=True, use_dissolve=False, edges=edges,
+                                    normal=normal)
+    bmesh.ops.recalc_face_normals(bm, faces=bm.faces)
+    bm.to_mesh(mesh)
+    bm.free()
+    mesh.update()
+    return mesh
+
+
+class Slab:
+    """
+    Array copy of a closed mesh that slabs across X can be cropped from
+    cheaply, so booleans only see the part of the mesh that matters
+    """
+
+    def __init__(self, mesh):
+        self.co, self.loop_start, self.loop_verts = mesh_arrays(mesh)
+        x = self.co[self.loop_verts, 0]
+        if len(self.loop_start) > 0:
+            self.face_min = np.minimum.reduceat(x, self.loop_start)
+            self.face_max = np.maximum.reduceat(x, self.loop_start)
+        else:
+            self.face_min = self.face_max = np.empty(0)
+
+    def crop(self, mesh, lo, hi):
+        """
+        Fill mesh with the closed slab lo <= X <= hi
+        """
+        keep = (self.face_max >= lo) & (self.face_min <= hi)
+        loop_start, loop_verts = gather_faces(self.loop_start, self.loop_verts, keep)
+        used, loop_verts = np.unique(loop_verts, return_inverse=True)
+        mesh_from_arrays(mesh, self.co[used], loop_start, loop_verts)
+        return cap_slab(mesh, lo, hi)
+
+def remove_doubles(mesh, dist=0.001):
+    """
+    Merge vertices of mesh closer than dist
+    """
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=dist)
+    bm.to_mesh(mesh)
+    bm.free()
+    mesh.update()
+
+def seam_targets(co, planes, dist):
+    """
+    {vertex: vertex it merges into} for vertices closer than dist, only
+    looking at vertices within dist of one of planes, (axis, value) pairs
+    """
+    near = np.zeros(len(co), dtype=bool)
+    for axis, value in planes:
+        near |= np.abs(co[:, axis] - value) <= dist
+    seam = np.flatnonzero(near)
+    if len(seam) < 2:
+        return {}
+    tree = KDTree(len(seam))
+    for i in seam:
+        tree.insert(co[i], int(i))
+    tree.balance()
+    targets = {}
+    for i in seam:
+        if i in targets:
+            continue
+        for position, j, d in tree.find_range(co[i], dist):
+            if j > i and j not in targets:
+                targets[j] = int(i)
+    return targets
+
+def weld_seams(mesh, planes, dist=0.001):
+    """
+    Merge vertices of mesh closer than dist along the seams booleans leave on
+    planes, cost follows the length of the seams rather than the whole mesh
+    Returns the number of vertices merged
+    """
+    targets = seam_targets(mesh_coords(mesh), planes, dist)
+    if len(targets) == 0:
+        return 0
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    bm.verts.ensure_lookup_table()
+    bmesh.ops.weld_verts(bm, targetmap={bm.verts[j]: bm.verts[i] for j, i in targets.items()})
+    bm.to_mesh(mesh)
+    bm.free()
+    mesh.update()
+    return len(targets)
+
+def vertex_components(count, edges):
+    """
+    Connected component label (0..n-1) of each of count vertices joined by
+    edges, an (m, 2) array, found with a vectorised union-find
+    """
+    parent = np.arange(count)
+    while True:
+        a = parent[edges[:, 0]]
+        b = parent[edges[:, 1]]
+        joined = a != b
+        if not joined.any():
+            break
+        # hook the larger root onto the smaller, then flatten the trees
+        np.minimum.at(parent, np.maximum(a, b)[joined], np.minimum(a, b)[joined])
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+    return np.unique(parent, return_inverse=True)[1]
+
+def loose_part_volumes(mesh):
+    """
+    Part label of each face of mesh and the signed volume of each part,
+    from the divergence theorem over its triangles
+    """
+    labels = vertex_components(len(mesh.vertices), mesh_edges(mesh))
+    loop_start, loop_verts, loop_edges = mesh_loops(mesh)
+    face_labels = labels[loop_verts[loop_start]]
+    mesh.calc_loop_triangles()
+    tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("vertices", tris)
+    co = mesh_coords(mesh).astype(np.float64)[tris.reshape(-1, 3)]
+    volume = np.einsum("ij,ij->i", co[:, 0], np.cross(co[:, 1], co[:, 2])) / 6
+    tri_labels = labels[tris[0::3]]
+    return face_labels, np.bincount(tri_labels, weights=volume, minlength=labels.max(initial=-1) + 1)
+
+def largest_parts(mesh, names, min_volume=MIN_PART_VOLUME, new_mesh=None):
+    """
+    New meshes, called names, for the len(names) largest loose parts of mesh
+    by volume, largest first
+    Parts smaller than min_volume are slivers and are never used, if there
+    aren't enough real parts a ValueError is raised
+    """
+    new_mesh = new_mesh or bpy.data.meshes.new
+    face_labels, volumes = loose_part_volumes(mesh)
+    order = [p for p in np.argsort(-volumes) if volumes[p] >= min_volume]
+    if len(order) < len(names):
+        raise ValueError("{} has {} parts, expected {}".format(mesh.name, len(order), len(names)))
+    co, loop_start, loop_verts = mesh_arrays(mesh)
+    parts = []
+    for name, part in zip(names, order):
+        part_start, part_verts = gather_faces(loop_start, loop_verts, face_labels == part)
+        used, part_verts = np.unique(part_verts, return_inverse=True)
+        parts.append(mesh_from_arrays(new_mesh(name), co[used], part_start, part_verts))
+    return parts
+
+def bevel_edges(bm, edges, offset=0.002, segments=4):
+    """
+    Bevel edges of bm, the same settings as the bevel operator defaults used
+    by the add-on
+    """
+    if len(edges) == 0:
+        return
+    bmesh.ops.bevel(bm, geom=list(edges), offset=offset, offset_type='OFFSET',
+                    profile_type='SUPERELLIPSE', segments=segments, profile=0.5,
+                    affect='EDGES', clamp_overlap=False, loop_slide=True,
+                    miter_outer='SHARP', miter_inner='SHARP', vmesh_method='ADJ')
+
+
+class Scratch:
+    """
+    A private scene for evaluating boolean modifiers on meshes that are not
+    linked to the user's scene
+    Temporary meshes made through the scratch are removed by close() unless
+    they have been handed over with keep()
+    """
+
+    def __init__(self, solver='MANIFOLD'):
+        self.temp_meshes = []
+        self.scene = bpy.data.scenes.new(SCRATCH_NAME)
+        self.placeholder = self.mesh(SCRATCH_NAME)
+        self.owner = bpy.data.objects.new(SCRATCH_NAME + "_owner", self.placeholder)
+        self.operand = bpy.data.objects.new(SCRATCH_NAME + "_operand", self.placeholder)
+        for o in (self.owner, self.operand):
+            self.scene.collection.objects.link(o)
+        self.modifier = self.owner.modifiers.new("scratch_bool", 'BOOLEAN')
+        self.modifier.solver = solver
+        self.modifier.object = self.operand
+        self.operands = bpy.data.collections.new(SCRATCH_NAME + "_operands")
+        self.scene.collection.children.link(self.operands)
+        # a new scene's view layer has no depsgraph until one is asked for
+        # with the scene as the context's
+        view_layer = self.scene.view_layers[0]
+        with bpy.context.temp_override(scene=self.scene, view_layer=view_layer):
+            self.depsgraph = bpy.context.evaluated_depsgraph_get()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def mesh(self, name, bm=None):
+        """
+        New temporary mesh, filled from bm if given
+        """
+        mesh = bpy.data.meshes.new(name)
+        if bm is not None:
+            bm.to_mesh(mesh)
+            bm.free()
+        self.temp_meshes.append(mesh)
+        return mesh
+
+    def block(self, name, center, dims):
+        return self.mesh(name, bm_block(bmesh.new(), center, dims))
+
+    def cylinder(self, name, center, radius, depth, vertices=32):
+        return self.mesh(name, bm_cylinder(bmesh.new(), center, radius, depth, vertices))
+
+    def copy(self, mesh, name):
+        new = mesh.copy()
+        new.name = name
+        self.temp_meshes.append(new)
+        return new
+
+    def from_object(self, obj, depsgraph, matrix=Matrix()):
+        """
+        Temporary copy of obj's evaluated mesh, transformed from world space
+        by matrix
+        """
+        mesh = bpy.data.meshes.new_from_object(obj.evaluated_get(depsgraph))
+        mesh.transform(matrix @ obj.matrix_world)
+        self.temp_meshes.append(mesh)
+        return mesh
+
+    def mark(self):
+        return len(self.temp_meshes)
+
+    def release(self, mark):
+        """
+        Remove the temporary meshes made since mark
+        """
+        bpy.data.batch_remove(self.temp_meshes[mark:])
+        del self.temp_meshes[mark:]
+
+    def slab(self, name, slab, lo, hi):
+        """
+        Temporary mesh cropped from Slab slab between X = lo and hi
+        """
+        return slab.crop(self.mesh(name), lo, hi)
+
+    def keep(self, mesh):
+        """
+        Hand mesh over to the caller, close() will leave it alone
+        """
+        self.temp_meshes.remove(mesh)
+        return mesh
+
+    def boolean(self, mesh, operation, operand):
+        """
+        Apply a boolean of operand to mesh in place
+        operand can be a list of meshes, which are all used in one solver
+        pass as a collection operand
+        """
+        operands = operand if isinstance(operand, (list, tuple)) else [operand]
+        if self.modifier.solver == 'MANIFOLD':
+            require_manifold([mesh] + operands, operation)
+        with boolean(mesh, operation, operands):
+            self.modifier.operation = operation
+            collected = []
+            if len(operands) == 1:
+                self.operand.data = operands[0]
+                self.modifier.operand_type = 'OBJECT'
+                operands[0].update()
+            else:
+                for m in operands:
+                    o = bpy.data.objects.new(SCRATCH_NAME + "_operand", m)
+                    self.operands.objects.link(o)
+                    collected.append(o)
+                    m.update()
+                self.modifier.operand_type = 'COLLECTION'
+                self.modifier.collection = self.operands
+            self.evaluate(mesh)
+            self.operand.data = self.placeholder
+            for o in collected:
+                bpy.data.objects.remove(o)
+        return mesh
+
+    def modify(self, mesh, type, **settings):
+        """
+        Apply a modifier of type, with settings, to mesh in place
+        """
+        modifier = self.owner.modifiers.new("scratch_" + type.lower(), type)
+        for name, value in settings.items():
+            setattr(modifier, name, value)
+        self.modifier.show_viewport = False
+        try:
+            with stage("modifier " + type):
+                self.evaluate(mesh)
+        finally:
+            self.modifier.show_viewport = True
+            self.owner.modifiers.remove(modifier)
+        return mesh
+
+    def evaluate(self, mesh):
+        """
+        Replace mesh with the result of the owner's modifier stack on it
+        """
+        self.owner.data = mesh
+        mesh.update()
+        self.owner.update_tag()
+        self.depsgraph.update()
+        evaluated = self.owner.evaluated_get(self.depsgraph)
+        bm = bmesh.new()
+        bm.from_mesh(evaluated.to_mesh())
+        evaluated.to_mesh_clear()
+        self.owner.data = self.placeholder
+        bm.to_mesh(mesh)
+        bm.free()
+        mesh.update()
+        return mesh
+
+    def close(self):
+        for o in (self.owner, self.operand):
+            bpy.data.objects.remove(o)
+        bpy.data.collections.remove(self.operands)
+        bpy.data.scenes.remove(self.scene)
+        bpy.data.batch_remove(self.temp_meshes)
+        self.temp_meshes = []
+
+registration_list = []
@@ -0,0 +1,178 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026 DTRabbit
+
+import bpy
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import numpy as np
+
+from time import perf_counter
+from types import SimpleNamespace
+
+from .meshops import Scratch, mesh_arrays, mesh_from_arrays
+from .utils import parts_collection
+from .generator import (support_spec,
+                        shell_key,
+                        instrument_slab,
+                        instrument_slab_source,
+                        slab_key,
+                        build_parts,
+                        link_parts,
+                        assign_parts,
+                        prune_templates)
+
+# Parallel support generation
+# The main process crops the instrument slab for each station and writes it,
+# with the plain number specs of the supports at that station, to a task file.
+# Worker processes (background Blender, or Python with the bpy module) run
+# the normal data engine on the tasks and write the parts back as mesh arrays.
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "worker.py")
+
+def worker_command(task_files):
+    if bpy.app.binary_path:
+        return [bpy.app.binary_path, "-b", "--factory-startup",
+                "--python", WORKER_SCRIPT, "--"] + task_files
+    return [sys.executable, WORKER_SCRIPT] + task_files
+
+def write_task(directory, index, slab_mesh, specs):
+    """
+    Write one station's slab and support specs, returns the task file
+    """
+    base = os.path.join(directory, "task_{}".format(index))
+    co, loop_start, loop_verts = mesh_arrays(slab_mesh)
+    np.savez(base + "_slab.npz", co=co, loop_start=loop_start, loop_verts=loop_verts)
+    with open(base + ".json", "w") as f:
+        json.dump({"slab": base + "_slab.npz",
+                   "specs": [vars(s) for s in specs],
+                   "result": base + "_result"}, f)
+    return base + ".json"
+
+def run_task(task_file):
+    """
+    Worker side, build every support of a task and write the parts
+    """
+    with open(task_file) as f:
+        task = json.load(f)
+    slab = np.load(task["slab"])
+    arrays = {}
+    report = []
+    with Scratch() as scratch:
+        instrument = mesh_from_arrays(scratch.mesh("Instrument"),
+                                      slab["co"], slab["loop_start"], slab["loop_verts"])
+        # the task's own stage store, so its supports share the pad shell
+        store = {}
+        section = lambda s: scratch.copy(instrument, "Instrument")
+        for i, spec in enumerate(task["specs"]):
+            s = SimpleNamespace(**spec)
+            start = perf_counter()
+            mark = scratch.mark()
+            origins = {}
+            try:
+                for suffix, (mesh, origin) in build_parts(scratch, s, section, store).items():
+                    co, loop_start, loop_verts = mesh_arrays(mesh)
+                    key = "{}_{}".format(i, suffix)
+                    arrays[key + "_co"] = co
+                    arrays[key + "_loop_start"] = loop_start
+                    arrays[key + "_loop_verts"] = loop_verts
+                    origins[suffix] = list(origin)
+                error = None
+            except Exception as e:
+                error = str(e)
+            scratch.release(mark)
+            report.append({"name": s.name, "seconds": perf_counter() - start,
+                           "error": error, "origins": origins})
+    np.savez(task["result"] + ".npz", **arrays)
+    with open(task["result"] + ".json", "w") as f:
+        json.dump(report, f)
+
+def read_result(task_file, stations, collection, failure="worker failed"):
+    """
+    Link the parts a worker made for one task
+    stations: [(support list item, orientation, spec)] in task order
+    failure: the error of each support if the worker left no result
+    """
+    with open(task_file) as f:
+        task = json.load(f)
+    if not os.path.exists(task["result"] + ".json"):
+        return [(item.name, 0.0, failure) for item, orientation, s in stations]
+    with open(task["result"] + ".json") as f:
+        results = json.load(f)
+    arrays = np.load(task["result"] + ".npz")
+    report = []
+    for i, ((support_item, orientation, s), result) in enumerate(zip(stations, results)):
+        if result["error"] is None:
+            parts = {}
+            for suffix, origin in result["origins"].items():
+                key = "{}_{}".format(i, suffix)
+                mesh = mesh_from_arrays(bpy.data.meshes.new(s.name + suffix), arrays[key + "_co"],
+                                        arrays[key + "_loop_start"], arrays[key + "_loop_verts"])
+                parts[suffix] = (mesh, origin)
+            assign_parts(support_item, link_parts(parts, s, collection), orientation)
+        report.append((support_item.name, result["seconds"], result["error"]))
+    return report
+
+def build_supports_parallel(scene, depsgraph, jobs, workers, collection=None):
+    """
+    build_supports spread over worker processes, one task per station so
+    base and lid supports still share a pad shell
+    collection: where the parts go, by default each instrument's parts
+    collection
+    Returns a list of (support name, seconds, error or None)
+    """
+    c_props = scene.case_props
+    m_props = scene.materials_props
+    prune_templates(scene)
+    directory = tempfile.mkdtemp(prefix="cases_")
+    report = []
+    try:
+        # group the supports by station
+        stations = {}
+        for instr_item, support_item, orientation in jobs:
+            s = support_spec(instr_item.instr, support_item, orientation, c_props, m_props)
+            stations.setdefault(shell_key(instr_item.instr, s), (instr_item, []))[1].append(
+                (support_item, orientation, s))
+        # crop the slabs here, the workers only ever see slices of the instruments
+        tasks = []
+        with Scratch() as scratch:
+            slabs = {}
+            for index, (instr_item, station) in enumerate(stations.values()):
+                instrument = instr_item.instr
+                s = station[0][2]
+                if slab_key(instrument, s) not in slabs:
+                    slabs[slab_key(instrument, s)] = instrument_slab_source(scratch, instrument, depsgraph, s)
+                slab_mesh = instrument_slab(scratch, slabs[slab_key(instrument, s)], s)
+                tasks.append((write_task(directory, index, slab_mesh, [s for i, o, s in station]),
+                              instr_item, station))
+        # run the workers, each one takes every n'th task
+        workers = max(1, min(workers, len(tasks)))
+        processes = [subprocess.Popen(worker_command([t for t, instr_item, station in tasks[w::workers]]),
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+                     for w in range(workers)]
+        # a worker's output goes into the errors of the supports it left no result for
+        failures = {}
+        for w, p in enumerate(processes):
+            err = p.communicate()[1]
+            if p.returncode != 0:
+                failure = "worker failed: " + err.decode(errors="replace").strip()[-2000:]
+                failures.update((t, failure) for t, instr_item, station in tasks[w::workers])
+        for task_file, instr_item, station in tasks:
+            report += read_result(task_file, station, collection or parts_collection(scene, instr_item),
+                                  failures.get(task_file, "worker failed"))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return report
+
+def generate_supports_parallel(context, jobs, workers, collection=None):
+    """
+    build_supports_parallel for the context's scene, parts go to collection
+    or their instrument's parts collection
+    """
+    return build_supports_parallel(context.scene, context.evaluated_depsgraph_get(), jobs, workers,
+                                   collection)
+
+registration_list = []
@@ -0,0 +1,164 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026 DTRabbit
+
+import numpy as np
+from bpy.types import Operator
+from bpy.props import IntProperty, EnumProperty, BoolProperty
+
+from time import perf_counter
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .sections import instrument_sections
+from .support_list import new_support, remove_parts
+from .utils import current_instr_list_item, forget_lists
+
+# Automatic placement of support stations
+# Every slice of the instrument's cross sections is a candidate station
+# centre, scored from the sections alone: a large section is a sturdy place
+# to hold, a sloping one lets the pad slide, and keys, posts and the bell
+# show up as bumps on the smoothed section size or as flare. The stations
+# are then picked one per stretch of the instrument, so they are spread out.
+
+# length (m) the section size is smoothed over to find keys and posts
+SMOOTHING = 0.031
+# spans tried, as multiples of the default span
+SPAN_STEPS = (1.0, 1.5, 2.0)
+# candidates are rejected with a steeper slope (radius change per length),
+# a bump of more than this share of the smoothed size, or a section this
+# many times the median size
+MAX_SLOPE = 0.35
+MAX_BUMP = 0.15
+FLARE = 1.6
+# score weights
+W_SIZE = 1.0
+W_SLOPE = 2.0
+W_BUMP = 3.0
+W_SPAN = 0.15
+W_SPACING = 0.5
+# least gap (m) between the edges of neighbouring stations
+MIN_GAP = 0.01
+# nearest a station centre may be to the instrument origin
+MIN_POSITION = 0.025
+
+def window(values, half, fill=None):
+    """
+    Windows of 2 * half + 1 values centred on each value, padded with fill,
+    or the end values if fill is None
+    """
+    padded = np.pad(values, half, mode='edge') if fill is None else \
+        np.pad(values, half, constant_values=fill)
+    return sliding_window_view(padded, 2 * half + 1)
+
+def station_scores(sections, span):
+    """
+    Score of a station of the given span centred on each slice, -inf where
+    one can't go
+    """
+    half = max(1, int(round(span / 2 / sections.step)))
+    radius = ((sections.y_max - sections.y_min) + (sections.z_max - sections.z_min)) / 4
+    missing = np.isnan(radius)
+    radius = np.where(missing, 0.0, radius)
+    smooth = np.median(window(radius, max(1, int(round(SMOOTHING / 2 / sections.step)))), axis=1)
+    median = np.median(smooth[~missing]) if (~missing).any() else 0.0
+    scale = np.maximum(smooth, sections.step)
+    bump = np.abs(radius - smooth) / scale
+    slope = np.abs(np.gradient(smooth, sections.step)) if len(smooth) > 1 else np.zeros(len(smooth))
+    # the worst of each over the station's span, outside the instrument is
+    # as bad as it gets
+    bump = window(np.where(missing, np.inf, bump), half, np.inf).max(axis=1)
+    slope = window(np.where(missing, np.inf, slope), half, np.inf).max(axis=1)
+    size = window(np.where(missing, 0.0, smooth), half, 0.0).min(axis=1)
+    scores = W_SIZE * np.minimum(size / max(median, sections.step), 1.0) \
+        - W_SLOPE * np.where(np.isfinite(slope), slope, 0.0) \
+        - W_BUMP * np.where(np.isfinite(bump), bump, 0.0)
+    flare = window(smooth, half, 0.0).max(axis=1) > FLARE * median
+    bad = ~np.isfinite(bump) | ~np.isfinite(slope) | (slope > MAX_SLOPE) | (bump > MAX_BUMP) | flare
+    return np.where(bad, -np.inf, scores)
+
+def place_stations(sections, origin_X, count, span):
+    """
+    Positions and spans of up to count stations along the instrument,
+    positions are from origin_X as SupportProperties.position is
+    Returns [(position, span)] in order along the instrument
+    """
+    if len(sections.xs) == 0 or count < 1:
+        return []
+    positions = sections.xs - origin_X
+    spans = np.array([span * m for m in SPAN_STEPS])
+    scores = np.stack([station_scores(sections, s) + W_SPAN * np.log2(m)
+                       for s, m in zip(spans, SPAN_STEPS)])
+    best = scores.argmax(axis=0)
+    score = scores[best, np.arange(len(positions))]
+    score[positions < MIN_POSITION] = -np.inf
+    # one station for each equal stretch of the instrument, near its middle
+    start, length = positions[0], positions[-1] - positions[0]
+    stretch = length / count
+    stations = []
+    for i in range(count):
+        target = start + stretch * (i + 0.5)
+        total = score - W_SPACING * np.abs(positions - target) / max(stretch, sections.step)
+        for p, s in stations:
+            total[np.abs(positions - p) < (s + spans[best]) / 2 + MIN_GAP] = -np.inf
+        k = int(total.argmax())
+        if not np.isfinite(total[k]):
+            break
+        stations.append((float(positions[k]), float(spans[best[k]])))
+    return sorted(stations)
+
+
+class PlaceSupports(Operator):
+    bl_idname = "support_list.place"
+    bl_label = "Place supports"
+    bl_description = "Add supports at stations picked from the instrument's cross sections"
+    bl_options = {"REGISTER", "UNDO"}
+
+    count: IntProperty(name="Stations",
+                       description="Number of support stations",
+                       default=3,
+                       min=1,
+                       max=20)
+    orientation: EnumProperty(name="Orientation",
+                              items=(('BASE', "Base", "Base supports only"),
+                                     ('LID', "Lid", "Lid supports only"),
+                                     ('BOTH', "Both", "A base and a lid support at each station")),
+                              default='BOTH')
+    replace: BoolProperty(name="Replace",
+                          description="Remove the instrument's current supports first",
+                          default=True)
+
+    @classmethod
+    def poll(cls, context):
+        instr_item = current_instr_list_item(context)
+        return instr_item is not None and instr_item.instr is not None and instr_item.instr.type == 'MESH'
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        start = perf_counter()
+        instr_item = current_instr_list_item(context)
+        instrument = instr_item.instr
+        defaults = context.scene.support_props
+        stations = place_stations(instrument_sections(instrument), instrument.location[0],
+                                  self.count, defaults.support_dim_X)
+        if len(stations) == 0:
+            self.report({'WARNING'}, "No station fits " + instrument.name)
+            return {'CANCELLED'}
+        if self.replace:
+            for support_item in instr_item.support_list:
+                remove_parts(support_item)
+            instr_item.support_list.clear()
+            instr_item.support_list_index = -1
+            forget_lists()
+        orientations = ('BASE', 'LID') if self.orientation == 'BOTH' else (self.orientation,)
+        for position, span in stations:
+            for o in orientations:
+                support_item = new_support(instr_item, defaults)
+                support_item.support_props.position = position
+                support_item.support_props.support_dim_X = span
+                support_item.orientation = o
+        self.report({'INFO'}, "Placed {} station{} in {:.3f}s".format(
+            len(stations), "" if len(stations) == 1 else "s", perf_counter() - start))
+        return {'FINISHED'}
+
+registration_list = (PlaceSupports,)
@@ -0,0 +1,127 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026 DTRabbit
+
+from .deferred import schedule, unschedule
+from .extents import geometry_version
+from .generator import build_supports, scene_depsgraph
+from .support_list import remove_parts, remove_objects
+
+# Live preview
+# While live preview is on, changing a setting of the active support rebuilds
+# it as a cheap proxy (decimated instrument, fewer segments, no bevels) once
+# input settles. The proxy is replaced by a full build when the settings have
+# been left alone for PREVIEW_TIMEOUT, or when a support is made by hand.
+
+# time (s) a preview build should take
+PREVIEW_BUDGET = 0.1
+# time (s) without changes before a preview is rebuilt at full quality
+PREVIEW_TIMEOUT = 2.0
+# preview detail steps, the step used adapts to the time builds take
+DETAIL_LEVELS = (1.0, 0.5, 0.25, 0.125)
+
+# instrument name to index into DETAIL_LEVELS
+_level = {}
+# instrument name to (geometry version, detail, {slab key: Slab}) of its preview slabs
+_slabs = {}
+
+def find_support(scene, name):
+    """
+    (instrument list item, support list item) of support name
+    """
+    for instr_item in scene.case_props.instrument_list:
+        for support_item in instr_item.support_list:
+            if support_item.name == name:
+                return instr_item, support_item
+    return None, None
+
+def active_support(scene):
+    c_props = scene.case_props
+    if not 0 <= c_props.instrument_list_index < len(c_props.instrument_list):
+        return None, None
+    instr_item = c_props.instrument_list[c_props.instrument_list_index]
+    if not 0 <= instr_item.support_list_index < len(instr_item.support_list):
+        return None, None
+    return instr_item, instr_item.support_list[instr_item.support_list_index]
+
+def support_parts(support_item):
+    return (support_item.support, support_item.pad, support_item.clamp, support_item.nut_plate)
+
+def schedule_preview(s_props, context):
+    """
+    Queue a preview of the active support if s_props are its settings and
+    it has not been built at full quality
+    """
+    scene = context.scene
+    if not scene.case_props.live_preview:
+        return
+    instr_item, support_item = active_support(scene)
+    if support_item is None or support_item.support_props.as_pointer() != s_props.as_pointer():
+        return
+    if support_item.support is not None and not support_item.preview:
+        return
+    name = support_item.name
+    unschedule(scene, "full:" + name)
+    schedule(scene, "preview:" + name, lambda scene, geometry: build_preview(scene, name))
+
+def cached_slabs(instrument, detail):
+    entry = _slabs.get(instrument.name)
+    if entry is not None and entry[0] == geometry_version(instrument) and entry[1] == detail:
+        return dict(entry[2])
+    return {}
+
+def build_preview(scene, name):
+    instr_item, support_item = find_support(scene, name)
+    if support_item is None or not scene.case_props.live_preview or instr_item.instr is None:
+        return
+    if support_item.support is not None and not support_item.preview:
+        return
+    instrument = instr_item.instr
+    level = _level.get(instrument.name, 1)
+    detail = DETAIL_LEVELS[level]
+    remove_parts(support_item)
+    slabs = cached_slabs(instrument, detail)
+    name, seconds, error = build_supports(scene, scene_depsgraph(scene),
+                                          [(instr_item, support_item, support_item.orientation)],
+                                          slabs=slabs, preview=True, detail=detail)[0]
+    _slabs[instrument.name] = (geometry_version(instrument), detail, slabs)
+    # step detail down when over budget and back up when well under it
+    if seconds > PREVIEW_BUDGET:
+        _level[instrument.name] = min(level + 1, len(DETAIL_LEVELS) - 1)
+    elif seconds < PREVIEW_BUDGET / 3:
+        _level[instrument.name] = max(level - 1, 0)
+    if error is not None:
+        support_item.error = error
+        return
+    support_item.preview = True
+    for obj in support_parts(support_item):
+        obj.show_wire = True
+    schedule(scene, "full:" + name, lambda scene, geometry: build_full(scene, name),
+             delay=PREVIEW_TIMEOUT)
+
+def build_full(scene, name):
+    """
+    Replace the preview of support name with a full quality build
+    The preview stays if the build fails, with the error on the support
+    """
+    instr_item, support_item = find_support(scene, name)
+    if support_item is None or not support_item.preview:
+        return
+    preview_parts = support_parts(support_item)
+    names = [obj.name for obj in preview_parts]
+    name, seconds, error = build_supports(scene, scene_depsgraph(scene),
+                                          [(instr_item, support_item, support_item.orientation)])[0]
+    if error is not None:
+        support_item.error = error
+        return
+    remove_objects(preview_parts)
+    # the new parts were named around the preview's, take its names over
+    for obj, part_name in zip(support_parts(support_item), names):
+        obj.name = obj.data.name = part_name
+    support_item.preview = False
+    support_item.error = ""
+
+def clear_cache():
+    _level.clear()
+    _slabs.clear()
+
+registration_list = []
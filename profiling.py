@@ -0,0 +1,195 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026 DTRabbit
+
+import bpy
+import json
+from bpy.types import Operator
+from bpy.props import StringProperty, EnumProperty
+
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+
+# Opt-in instrumentation of support generation
+# Generators mark their stages with stage() or lap(), and booleans with
+# boolean(). Nothing is recorded, and next to nothing is spent, unless a
+# Profile has been started with session().
+
+class Profile:
+    """
+    Stages recorded during one generator run, each event is a dict with
+    name, depth, start and seconds, operator calls, and vertex / face counts
+    for booleans
+    orphans: datablocks the whole run left without users, counted once at
+    each end as it means a pass over every mesh and object
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.origin = perf_counter()
+        self.events = []
+        self.open = []
+        self.laps = {}
+        self.ops = 0
+        self.orphans = 0
+
+    def begin(self, name, **args):
+        event = {"name": name, "depth": len(self.open), "start": perf_counter() - self.origin,
+                 "seconds": 0.0, "ops": self.ops, **args}
+        self.events.append(event)
+        self.open.append(event)
+        return event
+
+    def end(self, event):
+        # close anything still open inside event, e.g. its last lap
+        while self.open[-1] is not event:
+            self.end(self.open[-1])
+        self.open.pop()
+        self.laps = {d: l for d, l in self.laps.items() if l is not event}
+        event["seconds"] = perf_counter() - self.origin - event["start"]
+        event["ops"] = self.ops - event["ops"]
+
+    def lap(self, name):
+        """
+        End the last lap at this depth and start a new one
+        """
+        depth = len(self.open)
+        if depth > 0 and self.open[-1] is self.laps.get(depth - 1):
+            depth -= 1
+            self.end(self.laps[depth])
+        self.laps[depth] = self.begin(name)
+
+    def finish(self):
+        while self.open:
+            self.end(self.open[-1])
+
+    def totals(self):
+        """
+        Events summed by name, as {name: {count, seconds, ops, verts_in,
+        verts_out}} sorted by time
+        """
+        totals = {}
+        for e in self.events:
+            t = totals.setdefault(e["name"], dict.fromkeys(("count", "seconds", "ops",
+                                                            "verts_in", "verts_out"), 0))
+            t["count"] += 1
+            for k in ("seconds", "ops", "verts_in", "verts_out"):
+                t[k] += e.get(k, 0)
+        return dict(sorted(totals.items(), key=lambda item: -item[1]["seconds"]))
+
+    def to_json(self):
+        return {"name": self.name, "orphans": self.orphans, "events": self.events}
+
+    def to_chrome_trace(self):
+        """
+        Events in Chrome trace format, for chrome://tracing or Perfetto
+        """
+        return {"traceEvents": [{"name": e["name"], "ph": "X", "pid": 1, "tid": 1,
+                                 "ts": e["start"] * 1e6, "dur": e["seconds"] * 1e6,
+                                 "args": {k: v for k, v in e.items()
+                                          if k not in ("name", "start", "seconds")}}
+                                for e in self.events]}
+
+    def dump(self, filepath, format='JSON'):
+        with open(filepath, "w") as f:
+            json.dump(self.to_chrome_trace() if format == 'CHROME' else self.to_json(), f, indent=1)
+
+# the profile being recorded, and the last one finished
+_active = None
+last_profile = None
+
+def orphan_count():
+    return sum(1 for m in bpy.data.meshes if m.users == 0) + \
+           sum(1 for o in bpy.data.objects if o.users == 0)
+
+@contextmanager
+def session(name, enabled=True):
+    """
+    Record a profile of the enclosed code if enabled, it becomes
+    last_profile when done
+    """
+    global _active, last_profile
+    if not enabled or _active is not None:
+        yield None
+        return
+    _active = Profile(name)
+    orphans = orphan_count()
+    try:
+        yield _active
+    finally:
+        _active.finish()
+        _active.orphans = orphan_count() - orphans
+        last_profile, _active = _active, None
+
+@contextmanager
+def _stage(name, args):
+    event = _active.begin(name, **args)
+    try:
+        yield event
+    finally:
+        _active.end(event)
+
+def stage(name, **args):
+    """
+    Context manager timing the enclosed code as a stage
+    """
+    return nullcontext() if _active is None else _stage(name, args)
+
+def lap(name):
+    """
+    Time from here to the next lap, or the end of the enclosing stage
+    """
+    if _active is not None:
+        _active.lap(name)
+
+def count_op():
+    """
+    Note an operator call
+    """
+    if _active is not None:
+        _active.ops += 1
+
+def mesh_counts(meshes):
+    return sum(len(m.vertices) for m in meshes), sum(len(m.polygons) for m in meshes)
+
+@contextmanager
+def _boolean(mesh, operation, operands):
+    verts_in, faces_in = mesh_counts([mesh] + operands)
+    with _stage("boolean " + operation, {"operands": len(operands)}) as event:
+        yield event
+    event["verts_in"], event["faces_in"] = verts_in, faces_in
+    event["verts_out"], event["faces_out"] = mesh_counts([mesh])
+
+def boolean(mesh, operation, operands):
+    """
+    Context manager timing a boolean on mesh, with vertex and face counts
+    in (mesh and operand meshes) and out
+    """
+    return nullcontext() if _active is None else _boolean(mesh, operation, operands)
+
+
+class DumpProfile(Operator):
+    bl_idname = "profile.dump"
+    bl_label = "Save profile"
+    bl_description = "Save the last support generation profile as JSON or a Chrome trace"
+
+    filepath: StringProperty(subtype='FILE_PATH')
+    format: EnumProperty(name="Format",
+                         items=(('JSON', "JSON", "Events as a list of dicts"),
+                                ('CHROME', "Chrome trace", "For chrome://tracing or Perfetto")),
+                         default='JSON')
+
+    @classmethod
+    def poll(cls, context):
+        return last_profile is not None
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            self.filepath = "profile.json"
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        last_profile.dump(bpy.path.abspath(self.filepath), self.format)
+        return {'FINISHED'}
+
+registration_list = (DumpProfile,)
@@ -0,0 +1,64 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026 DTRabbit
+
+from .extents import geometry_version
+from .meshops import Scratch, Slab
+from .profiling import stage
+
+# Instrument proxies
+# Booleans against the instrument use a voxel remeshed copy of it instead of
+# the scan. Voxel remeshing always gives a closed manifold mesh, and its size
+# follows the voxel size, which comes from the clearance and pad thickness,
+# rather than the resolution of the scan.
+
+# voxel size as a share of the smaller of clearance and pad thickness
+PROXY_TOLERANCE = 0.25
+
+# (object session uid, voxel size) to (geometry version, Slab of the proxy)
+_proxies = {}
+
+def proxy_voxel_size(clearance, thickness):
+    return PROXY_TOLERANCE * min(clearance, thickness)
+
+def instrument_proxy(instrument, depsgraph, voxel_size, scratch=None):
+    """
+    Slab of a world space, voxel remeshed copy of instrument, only rebuilt
+    when the instrument has changed
+    A RuntimeError is raised if the remesh leaves nothing, so the support
+    fails with a reason instead of being cut from something else
+    """
+    key = (instrument.session_uid, round(voxel_size, 7))
+    version = geometry_version(instrument)
+    entry = _proxies.get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    if scratch is None:
+        with Scratch() as scratch:
+            return instrument_proxy(instrument, depsgraph, voxel_size, scratch)
+    with stage("instrument proxy", voxel_size=voxel_size):
+        mark = scratch.mark()
+        mesh = scratch.from_object(instrument, depsgraph)
+        scratch.modify(mesh, 'REMESH', mode='VOXEL', voxel_size=voxel_size, adaptivity=0.0)
+        empty = len(mesh.polygons) == 0
+        slab = None if empty else Slab(mesh)
+        scratch.release(mark)
+    if empty:
+        raise RuntimeError("voxel remesh of {} came out empty, turn the instrument proxy off".format(
+            instrument.name))
+    # proxies made from an older version of the instrument are no use now
+    for k in [k for k, v in _proxies.items() if k[0] == instrument.session_uid and v[0] != version]:
+        del _proxies[k]
+    _proxies[key] = (version, slab)
+    return slab
+
+def forget(obj):
+    """
+    Drop the proxies of obj
+    """
+    for k in [k for k in _proxies if k[0] == obj.session_uid]:
+        del _proxies[k]
+
+def clear_cache():
+    _proxies.clear()
+
+registration_list = []
@@ -0,0 +1,157 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026 DTRabbit
+
+import numpy as np
+
+from .export import mesh_triangles
+from .extents import geometry_version
+from .profiling import stage
+
+# Cross sections of instruments across X, all planes at once
+# Every triangle is paired with the planes between its lowest and highest X,
+# and each pair gives one segment of that plane's section. Segments are
+# oriented from the triangle normal so that the shoelace sum over a section
+# is its enclosed area, hollow parts subtract.
+
+# default distance (m) between slices
+SLICE_STEP = 0.001
+# triangle / plane pairs handled at once, bounds the memory used
+CHUNK = 1 << 21
+
+# (object session uid, step) to (geometry version, Sections)
+_sections = {}
+
+def slice_segments(co, tris, xs):
+    """
+    Section segments of a triangle mesh at the sorted planes X = xs
+    Returns (plane index (n,), segments (n, 2, 2) as (Y, Z) start and end)
+    """
+    tri_x = co[tris, 0]
+    # planes with lowest < x <= highest cut the triangle, vertices on a plane
+    # count as above it so every cut crosses exactly two edges
+    lo = np.searchsorted(xs, tri_x.min(axis=1), side='right')
+    count = np.searchsorted(xs, tri_x.max(axis=1), side='right') - lo
+    cut = np.flatnonzero(count)
+    lo, count = lo[cut], count[cut]
+    normals = np.cross(co[tris[cut, 1]] - co[tris[cut, 0]], co[tris[cut, 2]] - co[tris[cut, 0]])
+    planes, segments = [], []
+    # split the triangles so no chunk has many more than CHUNK pairs
+    ends = np.cumsum(count)
+    splits = np.searchsorted(ends, np.arange(CHUNK, ends[-1] if len(ends) else 0, CHUNK)) + 1
+    bounds = np.unique(np.concatenate([[0], splits, [len(cut)]]))
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        c = count[start:end]
+        pair_tri = np.repeat(np.arange(start, end), c)
+        pair_plane = np.arange(c.sum()) - np.repeat(np.cumsum(c) - c, c) + np.repeat(lo[start:end], c)
+        v = co[tris[cut[pair_tri]]]
+        x = xs[pair_plane][:, None]
+        above = v[:, :, 0] >= x
+        a, b = v, v[:, [1, 2, 0]]
+        crosses = above != above[:, [1, 2, 0]]
+        # edges along the plane give inf or NaN, they are never one of the crossed ones
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = (x - a[:, :, 0]) / (b[:, :, 0] - a[:, :, 0])
+            points = a[:, :, 1:] + t[:, :, None] * (b[:, :, 1:] - a[:, :, 1:])
+        # the two crossed edges of each pair
+        edge = np.argsort(~crosses, axis=1, kind='stable')[:, :2]
+        rows = np.arange(len(v))
+        p, q = points[rows, edge[:, 0]], points[rows, edge[:, 1]]
+        # orient along x cross normal, so the outside is on the right
+        n = normals[pair_tri]
+        flip = ((q - p) * np.stack([-n[:, 2], n[:, 1]], axis=1)).sum(axis=1) < 0
+        p[flip], q[flip] = q[flip], p[flip]
+        planes.append(pair_plane)
+        segments.append(np.stack([p, q], axis=1))
+    if len(planes) == 0:
+        return np.empty(0, dtype=np.int64), np.empty((0, 2, 2))
+    return np.concatenate(planes), np.concatenate(segments)
+
+
+class Sections:
+    """
+    Cross sections of a mesh at evenly spaced planes across X
+    xs: plane positions, y_min, y_max, z_min, z_max: section extents (NaN
+    where a plane misses the mesh), area: enclosed area, segments of plane
+    i: segments[offsets[i]:offsets[i + 1]]
+    """
+
+    def __init__(self, co, tris, step=SLICE_STEP):
+        self.step = step
+        x = co[:, 0]
+        if len(x) == 0:
+            self.xs = np.empty(0)
+        else:
+            self.xs = np.arange(x.min() + step / 2, x.max(), step)
+        plane, segments = slice_segments(co, tris, self.xs)
+        order = np.argsort(plane, kind='stable')
+        plane, self.segments = plane[order], segments[order]
+        counts = np.bincount(plane, minlength=len(self.xs))
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+        p, q = self.segments[:, 0], self.segments[:, 1]
+        self.area = 0.5 * np.bincount(plane, weights=p[:, 0] * q[:, 1] - q[:, 0] * p[:, 1],
+                                      minlength=len(self.xs))
+        self.y_min, self.y_max, self.z_min, self.z_max = (np.full(len(self.xs), np.nan) for i in range(4))
+        hit = counts > 0
+        if hit.any():
+            starts = self.offsets[:-1][hit]
+            for axis, low, high in ((0, self.y_min, self.y_max), (1, self.z_min, self.z_max)):
+                values = self.segments[:, :, axis].reshape(-1)
+                low[hit] = np.minimum.reduceat(values, starts * 2)
+                high[hit] = np.maximum.reduceat(values, starts * 2)
+
+    def index(self, x):
+        """
+        Index of the plane nearest X = x
+        """
+        return np.clip(np.rint((np.asarray(x) - self.xs[0]) / self.step).astype(int), 0, len(self.xs) - 1)
+
+    def radii(self, x):
+        """
+        Half the Y and Z extents of the section nearest X = x
+        """
+        i = self.index(x)
+        return (self.y_max[i] - self.y_min[i]) / 2, (self.z_max[i] - self.z_min[i]) / 2
+
+    def polylines(self, i):
+        """
+        Segments of plane i chained into polylines, lists of (Y, Z) points,
+        closed loops end where they start
+        """
+        segments = self.segments[self.offsets[i]:self.offsets[i + 1]]
+        key = lambda p: (round(float(p[0]), 7), round(float(p[1]), 7))
+        following = {key(s[0]): k for k, s in enumerate(segments)}
+        used = np.zeros(len(segments), dtype=bool)
+        lines = []
+        for k in range(len(segments)):
+            if used[k]:
+                continue
+            line = [tuple(segments[k][0])]
+            while k is not None and not used[k]:
+                used[k] = True
+                line.append(tuple(segments[k][1]))
+                k = following.get(key(segments[k][1]))
+            lines.append(line)
+        return lines
+
+def instrument_sections(obj, step=SLICE_STEP):
+    """
+    Sections of obj in world space, only recomputed when obj has changed
+    """
+    key = (obj.session_uid, step)
+    version = geometry_version(obj)
+    entry = _sections.get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    with stage("instrument sections", step=step):
+        sections = Sections(*mesh_triangles(obj), step)
+    _sections[key] = (version, sections)
+    return sections
+
+def forget(obj):
+    for k in [k for k in _sections if k[0] == obj.session_uid]:
+        del _sections[k]
+
+def clear_cache():
+    _sections.clear()
+
+registration_list = []
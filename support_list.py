@@ -1,14 +1,14 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # SPDX-FileCopyrightText: 2026 DTRabbit
 
+import bpy
 from bpy.types import PropertyGroup, UIList, Object, Operator
-from bpy.props import CollectionProperty, IntProperty, PointerProperty, StringProperty
+from bpy.props import CollectionProperty, IntProperty, PointerProperty, StringProperty, EnumProperty, BoolProperty
 
 from .support_props import SupportProperties
-from .utils import (current_instr,
-                   delete_objects,
-                   current_instr_list_item,
-                   current_support_list_item)
+from .utils import (current_instr_list_item,
+                   current_support_list_item,
+                   forget_lists)
 
 def init_item(item, s_props):
         item.thickness = s_props.thickness
@@ -28,6 +28,66 @@ def init_item(item, s_props):
         item.clamp = None
         item.nut_plate = None
 
+def new_support(props, defaults):
+    """
+    Add a support with settings from defaults to instrument list item props
+    and make it the current support
+    """
+    props.support_list.add()
+    forget_lists()
+    props.support_list_index = len(props.support_list) - 1
+    props.support_list[-1].name = props.instr.name + "_S" + str(props.support_count)
+    props.support_count += 1
+    init_item(props.support_list[-1].support_props, defaults)
+    return props.support_list[-1]
+
+def copy_support(props, index):
+    """
+    Add a copy of support index to instrument list item props and make it
+    the current support
+    """
+    orientation = props.support_list[index].orientation
+    props.support_list.add()
+    forget_lists()
+    s_props = props.support_list[index].support_props
+    props.support_list_index = len(props.support_list) - 1
+    props.support_list[-1].name = props.instr.name + "_S" + str(props.support_count)
+    props.support_count += 1
+    init_item(props.support_list[-1].support_props, s_props)
+    props.support_list[-1].support_props.position = s_props.position
+    props.support_list[-1].orientation = orientation
+    return props.support_list[-1]
+
+def remove_parts(item):
+    """
+    Remove the generated objects of a support list item, and meshes nothing
+    else uses, with the data API
+    """
+    remove_all_parts([item])
+
+def remove_all_parts(items):
+    """
+    remove_parts for many support list items, objects and then meshes are
+    each removed in one batch
+    """
+    remove_objects([obj for item in items for obj in (item.support, item.pad, item.clamp, item.nut_plate)])
+    for item in items:
+        item.support = None
+        item.pad = None
+        item.clamp = None
+        item.nut_plate = None
+        item.preview = False
+        item.error = ""
+
+def remove_objects(objects):
+    """
+    Remove objects, skipping None, and then the meshes nothing else uses
+    """
+    objects = [obj for obj in objects if obj is not None]
+    meshes = [obj.data for obj in objects if obj.data is not None]
+    bpy.data.batch_remove(objects)
+    bpy.data.batch_remove([mesh for mesh in meshes if mesh.users == 0])
+
 class SupportListItem(PropertyGroup):
 
     name: StringProperty()
@@ -36,6 +96,16 @@ class SupportListItem(PropertyGroup):
     pad: PointerProperty(type=Object)
     clamp: PointerProperty(type=Object)
     nut_plate: PointerProperty(type=Object)
+    orientation: EnumProperty(name="Orientation",
+                              description="Which half of the case the support is for",
+                              items=(('BASE', "Base", "Support for the base of the case"),
+                                     ('LID', "Lid", "Support for the lid of the case")),
+                              default='BASE')
+    preview: BoolProperty(name="Preview",
+                          description="The generated parts are a low resolution preview",
+                          default=False)
+    error: StringProperty(name="Error",
+                          description="Why the last live preview or background build failed")
 
 class SupportList(UIList):
 
@@ -59,12 +129,7 @@ class SupportListNewItem(Operator):
             (context.scene.case_props.instrument_list_index >= 0)
 
     def execute(self, context):
-        props = current_instr_list_item(context) #if context.scene.case_props.instrument_list_index >= 0 else context.scene.case_props
-        props.support_list.add()
-        props.support_list_index = len(props.support_list) - 1
-        props.support_list[-1].name = current_instr(context).name + "_S" + str(props.support_count)
-        props.support_count += 1
-        init_item(props.support_list[-1].support_props, context.scene.support_props)
+        new_support(current_instr_list_item(context), context.scene.support_props)
         return {'FINISHED'}
 
 class SupportListDeleteItem(Operator):
@@ -84,9 +149,9 @@ class SupportListDeleteItem(Operator):
         props = current_instr_list_item(context) #if context.scene.case_props.instrument_list_index >= 0 else context.scene.case_props
         support_list = props.support_list
         index = props.support_list_index
-        if support_list[index].support is not None:
-            delete_objects([support_list[index].support, support_list[index].pad, support_list[index].clamp, support_list[index].nut_plate])
+        remove_parts(support_list[index])
         support_list.remove(index)
+        forget_lists()
         props.support_list_index = min(max(0, index-1), len(support_list)-1)
         return {'FINISHED'}
 
@@ -104,14 +169,7 @@ class SupportListCopyItem(Operator):
             return instr.support_list_index > -1
 
     def execute(self, context):
-        props = current_instr_list_item(context) #if context.scene.case_props.instrument_list_index >= 0 else context.scene.case_props
-        s_props = props.support_list[props.support_list_index].support_props
-        props.support_list.add()
-        props.support_list_index = len(props.support_list) - 1
-        props.support_list[-1].name = current_instr(context).name + "_S" + str(props.support_count)
-        props.support_count += 1
-        init_item(props.support_list[-1].support_props, s_props)
-        props.support_list[-1].support_props.position = s_props.position
+        copy_support(current_instr_list_item(context), current_instr_list_item(context).support_list_index)
         return {'FINISHED'}
 
 class SupportListRemoveObjects(Operator):
@@ -128,12 +186,7 @@ class SupportListRemoveObjects(Operator):
             return item.support is not None
 
     def execute(self, context):
-        props = current_support_list_item(context)
-        delete_objects([props.support, props.pad, props.clamp, props.nut_plate])
-        props.support = None
-        props.pad = None
-        props.clamp = None
-        props.nut_plate = None
+        remove_parts(current_support_list_item(context))
         return {'FINISHED'}
 
 
@@ -2,11 +2,13 @@
 # SPDX-FileCopyrightText: 2026 DTRabbit
 
 import bpy
-import bmesh
 from bpy.types import Operator
 
 # from math import round
-from mathutils import Vector
+from math import pi
+from mathutils import Matrix, Vector
+from time import perf_counter
+from types import SimpleNamespace
 
 from .utils import (X, Y, Z,
                     current_instr,
@@ -14,96 +16,39 @@ from .utils import (X, Y, Z,
                     apply_transformations,
                     add_block,
                     add_and_apply_bool,
+                    add_and_apply_bools,
+                    BooleanPlan,
                     remove_doubles,
                     separate_parts,
-                    select_object,
                     delete_object,
+                    move_objects,
+                    parts_collection,
                     add_cylinder,
-                    average,
+                    purge_temporaries,
+                    current_instr_list_item,
                     current_support_list_item
                     )
+from .generator import (generate_support,
+                        generate_supports,
+                        support_bevel_edges,
+                        pad_bevel_edges,
+                        bevel_mesh,
+                        station_planes,
+                        SLAB_MARGIN)
+from .meshops import Slab
+from .proxy import instrument_proxy, proxy_voxel_size
+from .parallel import generate_supports_parallel
+from .profiling import session, stage, lap
+from .support_list import copy_support, remove_parts
 
 def bevel_support(support, s_props, support_dim_Y, axis_to_base_Z, flange_dim_Z):
-    select_object(support)
-    bpy.ops.object.mode_set(mode='EDIT')
-    select_mode = bpy.context.tool_settings.mesh_select_mode[:]
-    bpy.context.tool_settings.mesh_select_mode = (False, True, False)
-    bm = bmesh.from_edit_mesh(support.data)
-
-    ref_corner_loc = [round(s_props.support_dim_X /2, 4),
-                      round(support_dim_Y / 2, 4),
-                      round((axis_to_base_Z / 2) - (s_props.separation / 2), 4)]
-    flange_top_edges = []
-    for e in bm.edges:
-        e.select = False
-        # is e on top of support
-        for v in e.verts:
-            abs_loc = [abs(round(c, 4)) for c in v.co]
-            if ref_corner_loc == abs_loc: e.select = True
-        # is e on top of flange
-        if (round(e.verts[0].co[Z], 4) == round(e.verts[1].co[Z], 4)) and \
-           (round(e.verts[1].co[Z], 4) == -round((axis_to_base_Z / 2) - flange_dim_Z, 4)):
-            flange_top_edges.append(e)
-    shortest_edge_len = 100
-    for e in flange_top_edges:
-        shortest_edge_len = round(e.calc_length(), 4) if e.calc_length() < shortest_edge_len \
-                                                      else shortest_edge_len
-    for e in flange_top_edges:
-        edge_len = round(e.calc_length(), 4)
-        if (edge_len == shortest_edge_len) or \
-           (edge_len == round(s_props.support_dim_X, 4)) or \
-           (edge_len == round(support_dim_Y, 4)):
-            e.select = True
-    bpy.ops.mesh.bevel(offset=0.002, offset_pct=0, segments=4, affect='EDGES')
-    bpy.context.tool_settings.mesh_select_mode = select_mode
-    bpy.ops.object.mode_set(mode='OBJECT')
+    s = SimpleNamespace(support_dim_X=s_props.support_dim_X,
+                        separation=s_props.separation,
+                        axis_to_base_Z=axis_to_base_Z)
+    bevel_mesh(support.data, support_bevel_edges(support.data, s, support_dim_Y, flange_dim_Z, (0, 0, 0)))
 
 def bevel_pad(pad, s_props):
-    select_object(pad)
-    bpy.ops.object.mode_set(mode='EDIT')
-    select_mode = bpy.context.tool_settings.mesh_select_mode[:]
-    bpy.context.tool_settings.mesh_select_mode = (False, True, False)
-    bm = bmesh.from_edit_mesh(pad.data)
-
-    ref_Z = round((s_props.separation / 2), 4)
-    candidate_edges = []
-    other_edges = []
-    high_X = 0
-    low_X = 0
-    for e in bm.edges:
-        e.select = False
-        for v in e.verts:
-            abs_Z = abs(round(v.co[Z], 4))
-            high_X = round(v.co[X], 4) if round(v.co[X], 4) > high_X else high_X
-            low_X = round(v.co[X], 4) if round(v.co[X], 4) < low_X else low_X
-            if ref_Z == abs_Z:
-                if (round(e.other_vert(v).co[Z], 4) == round(v.co[Z], 4)):
-                    if (round(e.other_vert(v).co[X], 4) == round(v.co[X], 4)) and \
-                       (e not in candidate_edges):
-                        candidate_edges.append(e)
-                    elif (round(e.other_vert(v).co[X], 4) != round(v.co[X], 4)) and \
-                         (e not in other_edges):
-                        other_edges.append(e)
-    loop_edges = [[e for e in candidate_edges if round(e.verts[0].co[X], 4) == high_X],
-                  [e for e in candidate_edges if round(e.verts[0].co[X], 4) == low_X]]
-    low_Y = 100
-    for e in other_edges:
-        for v in e.verts:
-            low_Y = abs(round(v.co[Y], 4)) \
-                    if abs(round(v.co[Y], 4)) < low_Y \
-                    else low_Y
-    inner_edges = [e for e in other_edges \
-                     if (abs(round(e.verts[0].co[Y], 4)) == low_Y) or \
-                        (abs(round(e.verts[1].co[Y], 4)) == low_Y)]
-    for l in loop_edges:
-        for e in l:
-            e.select = True
-        bpy.ops.mesh.shortest_path_select()
-    for e in inner_edges:
-        e.select = True
-    bpy.ops.mesh.bevel(offset=0.002, offset_pct=0, segments=4, affect='EDGES')
-    bpy.context.tool_settings.mesh_select_mode = select_mode
-    bpy.ops.object.mode_set(mode='OBJECT')
+    bevel_mesh(pad.data, pad_bevel_edges(pad.data, s_props))
 
 def build_nut_washer(loc, s_props, m_props):
     flange_top = loc[Z] + m_props.l_sec_thickness / 2
@@ -140,10 +85,9 @@ def build_slot(location, s_props, flange_dim_Z):
 
 def build_support(self, context, orientation):
 
-    # get the current instrument, make sure it's selected,
+    # get the current instrument, make sure it's
     # in the right mode and has no scale or rotation
     instrument = current_instr(context)
-    select_object(instrument)
     set_mode(instrument, 'OBJECT')
     apply_transformations(instrument, S=True, R=True)
 
@@ -168,6 +112,23 @@ def build_support(self, context, orientation):
                         instrument.location[Y],
                         instrument.location[Z] - (axis_to_base_Z / 2)]
 
+    # crop the instrument to a slab around the support so the booleans only
+    # have to deal with the part of the instrument that matters
+    lap("section")
+    half = s_props.support_dim_X / 2 + SLAB_MARGIN
+    if c_props.use_proxy:
+        # the proxy is already in world space
+        source = instrument_proxy(instrument, context.evaluated_depsgraph_get(),
+                                  proxy_voxel_size(c_props.clearance, s_props.thickness))
+        slab = bpy.data.objects.new("Slab", source.crop(bpy.data.meshes.new("Slab"),
+                                                        support_loc_X - half, support_loc_X + half))
+    else:
+        slab = bpy.data.objects.new("Slab", Slab(instrument.data).crop(bpy.data.meshes.new("Slab"),
+                                                                       s_props.position - half,
+                                                                       s_props.position + half))
+        slab.matrix_world = instrument.matrix_world
+    context.collection.objects.link(slab)
+
     # construct a section of the instrument for building the pad, support and clamp spacer
     # a cube slightly wider than the support and scaled bigger than the max size
     # in Y and Z
@@ -176,16 +137,21 @@ def build_support(self, context, orientation):
                                     (s_props.support_dim_X, 1, 1))
 
     # cut instrument from block
-    add_and_apply_bool(support_item.pad, 'INTERSECT', instrument)
+    lap("pad shell")
+    add_and_apply_bool(support_item.pad, 'INTERSECT', slab)
     # scale the section to allow pad thickness
     pad_scale = 1+(2*(s_props.thickness)/min(support_item.pad.dimensions[Y],
                                                 support_item.pad.dimensions[Z]))
     support_item.pad.scale = (1, pad_scale, pad_scale)
     apply_transformations(support_item.pad, S = True)
     # cut instrument from centre of scaled pad
-    add_and_apply_bool(support_item.pad, 'DIFFERENCE', instrument)
+    add_and_apply_bool(support_item.pad, 'DIFFERENCE', slab)
+    slab_mesh = slab.data
+    bpy.data.objects.remove(slab)
+    bpy.data.meshes.remove(slab_mesh)
 
     # add support
+    lap("support block")
     # calculate size of support across instrument (Y)
     support_dim_Y = support_item.pad.dimensions[Y] + 2 * (s_props.thickness + s_props.extension)
     # scale vector for support from support_dim_X to required depth (Y) and height (Z)
@@ -199,6 +165,7 @@ def build_support(self, context, orientation):
     add_and_apply_bool(support, 'DIFFERENCE', support_item.pad)
 
     # make a temporary block for cutting the separation gap
+    lap("gap cut")
     gap = add_block("Gap",
                     (support_loc_X, instrument.location[Y], instrument.location[Z]),
                     (1, 1, s_props.separation))
@@ -206,16 +173,19 @@ def build_support(self, context, orientation):
     add_and_apply_bool(support_item.pad, 'DIFFERENCE', gap)
     delete_object(gap)
 
-    # clean up objects and identify parts
-    remove_doubles(support)
-    remove_doubles(support_item.pad)
+    # clean up objects along the boolean seams and identify parts
+    lap("split")
+    seams = station_planes(SimpleNamespace(support_dim_X=s_props.support_dim_X,
+                                           separation=s_props.separation,
+                                           axis_to_base_Z=axis_to_base_Z), support_dim_Y)
+    remove_doubles(support, [(axis, v + axis_to_base_Z / 2 if axis == Z else v) for axis, v in seams])
+    remove_doubles(support_item.pad, seams)
     support_item.support, support_item.clamp = separate_parts(support,
                                                                 large_name=support_item.name+"H",
                                                                 small_name=support_item.name+"C")
-    remove_doubles(support_item.support)
-    remove_doubles(support_item.clamp)
 
     # make flange
+    lap("flange")
     flange_ext_Y = max(s_props.flange_extension, s_props.washer_diam *2)
     flange_ext_X = s_props.slot_length + s_props.screw_diam + s_props.washer_diam + 0.002
     flange_dim_Y = support_dim_Y + 2 * flange_ext_Y
@@ -236,12 +206,14 @@ def build_support(self, context, orientation):
                                     radius=flange_radius, depth=flange_dim_Z,
                                     vertices=64),
                        del_object=True)
-    remove_doubles(support_item.support)
+    remove_doubles(support_item.support, [(Z, flange_dim_Z - axis_to_base_Z / 2)])
 
+    lap("bevel")
     bevel_support(support_item.support, s_props, support_dim_Y, axis_to_base_Z, flange_dim_Z)
     bevel_pad(support_item.pad, s_props)
 
     # make the nut plate
+    lap("nut plate")
     nut_plate_loc_Z = flange_loc_Z - flange_dim_Z - m_props.int_ply_thickness
     support_item.nut_plate = add_cylinder(name=support_item.name+"N",
                                           location=[flange_loc_X, flange_loc_Y, nut_plate_loc_Z],
@@ -250,44 +222,107 @@ def build_support(self, context, orientation):
     # make screw slots in flange and nut holes in nut plate
     slot_dim_X = s_props.slot_length + s_props.washer_diam + 0.002
 
+    lap("fastener cuts")
+    plan = BooleanPlan()
     for pos in [1, -1]:
         # make slots and nuts on X axis
         slot_loc_X = flange_loc_X - pos * flange_radius + pos * (slot_dim_X / 2 + 0.005)
         slot_loc = Vector([slot_loc_X, flange_loc_Y, flange_loc_Z])
-        add_and_apply_bool(support_item.support,
-                           'DIFFERENCE',
-                           build_slot(slot_loc, s_props, flange_dim_Z),
-                           del_object=True)
+        plan.add(support_item.support, 'DIFFERENCE', build_slot(slot_loc, s_props, flange_dim_Z))
         nut_loc = Vector([slot_loc_X, flange_loc_Y, nut_plate_loc_Z])
-        add_and_apply_bool(support_item.nut_plate,
-                            'DIFFERENCE',
-                            build_nut_washer(nut_loc, s_props, m_props),
-                            del_object=True)
+        plan.add(support_item.nut_plate, 'DIFFERENCE', build_nut_washer(nut_loc, s_props, m_props))
         # make slots and nuts on Y axis
         slot_loc_Y = flange_loc_Y + pos * ((support_dim_Y / 2) + s_props.washer_diam)
         slot_loc = Vector([flange_loc_X, slot_loc_Y, flange_loc_Z])
-        add_and_apply_bool(support_item.support,
-                           'DIFFERENCE',
-                           build_slot(slot_loc, s_props, flange_dim_Z),
-                           del_object=True)
+        plan.add(support_item.support, 'DIFFERENCE', build_slot(slot_loc, s_props, flange_dim_Z))
         nut_loc = Vector([flange_loc_X, slot_loc_Y, nut_plate_loc_Z])
-        add_and_apply_bool(support_item.nut_plate,
-                            'DIFFERENCE',
-                            build_nut_washer(nut_loc, s_props, m_props),
-                            del_object=True)
+        plan.add(support_item.nut_plate, 'DIFFERENCE', build_nut_washer(nut_loc, s_props, m_props))
+    # one solver pass for all the slots and one for all the nut holes
+    plan.execute(lambda owner, operation, cutters: add_and_apply_bools(owner, operation, cutters, True))
 
-    # rotate the support structures through X=180 degrees if it's a lid support
+    parts = (support_item.support, support_item.pad, support_item.clamp, support_item.nut_plate)
+    # rotate the support structures through X=180 degrees about the
+    # instrument's axis if it's a lid support
     if orientation == 'LID':
-        context.scene.cursor.location = instrument.location
-        pivot_point = context.scene.tool_settings.transform_pivot_point
-        context.scene.tool_settings.transform_pivot_point = 'CURSOR'
-        for o in (support_item.support, support_item.pad, support_item.clamp, support_item.nut_plate):
-            select_object(o)
-            bpy.ops.transform.rotate(value=3.14159, orient_axis='X')
-        context.scene.tool_settings.transform_pivot_point = pivot_point
-
-    # make sure the original object is selected at the end
-    select_object(instrument)
+        lap("lid rotation")
+        pivot = Vector(instrument.location)
+        rotation = Matrix.Translation(pivot) @ Matrix.Rotation(pi, 4, 'X') @ Matrix.Translation(-pivot)
+        for o in parts:
+            o.matrix_world = rotation @ o.matrix_world
+
+    support_item.orientation = orientation
+    move_objects(parts, parts_collection(context.scene, current_instr_list_item(context)))
+
+def profiled(context, name):
+    """
+    Profile the enclosed generation if profiling is on
+    """
+    return session(name, context.scene.case_props.profile)
+
+def report_temporaries(self, freed, peak):
+    if self is not None:
+        self.report({'INFO'}, "Freed {} temporary meshes, peak temporary memory {:.2f} MB".format(
+            freed, peak / 2 ** 20))
+
+def generate(self, context, orientation):
+    support_item = current_support_list_item(context)
+    if support_item.preview:
+        remove_parts(support_item)
+    with profiled(context, support_item.name + " " + orientation.lower()):
+        if context.scene.case_props.engine == 'DATA':
+            try:
+                generate_support(context, current_instr_list_item(context),
+                                 current_support_list_item(context), orientation)
+            except RuntimeError as e:
+                self.report({'ERROR'}, str(e))
+                return {'CANCELLED'}
+        else:
+            try:
+                with stage(support_item.name, orientation=orientation):
+                    build_support(self, context, orientation)
+            finally:
+                report_temporaries(self, *purge_temporaries())
+    return {'FINISHED'}
+
+def missing_supports(context):
+    """
+    (instrument list item, support list item, orientation) for every support
+    without generated parts, or with only a preview
+    """
+    return [(instr_item, support_item, support_item.orientation)
+            for instr_item in context.scene.case_props.instrument_list
+            for support_item in instr_item.support_list
+            if support_item.support is None or support_item.preview]
+
+def build_support_batch(self, context, jobs):
+    """
+    Run build_support for each job by making it the current support
+    """
+    c_props = context.scene.case_props
+    index = c_props.instrument_list_index
+    # every instrument's selected support, taken before any is changed
+    selected = [(instr_item, instr_item.support_list_index) for instr_item, support_item, orientation in jobs]
+    report = []
+    freed, peak = 0, 0
+    for instr_item, support_item, orientation in jobs:
+        start = perf_counter()
+        c_props.instrument_list_index = list(c_props.instrument_list).index(instr_item)
+        instr_item.support_list_index = list(instr_item.support_list).index(support_item)
+        try:
+            with stage(support_item.name, orientation=orientation):
+                build_support(self, context, orientation)
+            error = None
+        except Exception as e:
+            error = str(e)
+        # free each support's leftovers before the next one
+        n, p = purge_temporaries()
+        freed, peak = freed + n, max(peak, p)
+        report.append((support_item.name, perf_counter() - start, error))
+    c_props.instrument_list_index = index
+    for instr_item, support_index in selected:
+        instr_item.support_list_index = support_index
+    report_temporaries(self, freed, peak)
+    return report
 
 
 class MakeSupports(Operator):
@@ -302,11 +337,10 @@ class MakeSupports(Operator):
         if instr is None:
             return False
         else:
-            return instr.support is None
+            return instr.support is None or instr.preview
 
     def execute(self, context):
-        build_support(self, context, 'BASE')
-        return {'FINISHED'}
+        return generate(self, context, 'BASE')
 
 
 class MakeHolders(Operator):
@@ -321,11 +355,117 @@ class MakeHolders(Operator):
         if instr is None:
             return False
         else:
-            return instr.support is None
+            return instr.support is None or instr.preview
 
 
     def execute(self, context):
-        build_support(self, context, 'LID')
+        return generate(self, context, 'LID')
+
+
+class MakeAll(Operator):
+    bl_idname = "make.all"
+    bl_label = "Make all instrument supports"
+    bl_description = "Creates every support that has not been generated yet, in every instrument"
+    bl_options = {"REGISTER", "UNDO"}
+
+    @classmethod
+    def poll(cls, context):
+        return any(s.support is None or s.preview for i in context.scene.case_props.instrument_list
+                                                  for s in i.support_list)
+
+    def execute(self, context):
+        start = perf_counter()
+        jobs = missing_supports(context)
+        for instr_item, support_item, orientation in jobs:
+            if support_item.preview:
+                remove_parts(support_item)
+        c_props = context.scene.case_props
+        with profiled(context, "all supports"):
+            if c_props.engine == 'DATA' and c_props.workers > 0:
+                report = generate_supports_parallel(context, jobs, c_props.workers)
+            elif c_props.engine == 'DATA':
+                report = generate_supports(context, jobs)
+            else:
+                report = build_support_batch(self, context, jobs)
+        failed = 0
+        for name, seconds, error in report:
+            if error is not None:
+                failed += 1
+                self.report({'WARNING'}, "{} failed: {}".format(name, error))
+        self.report({'INFO'}, "Made {} of {} supports in {:.2f}s".format(len(report) - failed,
+                                                                       len(report),
+                                                                       perf_counter() - start))
         return {'FINISHED'}
 
-registration_list = (MakeSupports, MakeHolders)
+
+def companion(instr_item, index):
+    """
+    Index of an unbuilt support of the opposite orientation at the same
+    station as support index, a copy is added if there isn't one
+    """
+    item = instr_item.support_list[index]
+    other = 'LID' if item.orientation == 'BASE' else 'BASE'
+    s_props = item.support_props
+    for i, c in enumerate(instr_item.support_list):
+        if c.orientation == other and c.support is None and \
+           c.support_props.position == s_props.position and \
+           c.support_props.support_dim_X == s_props.support_dim_X and \
+           c.support_props.thickness == s_props.thickness:
+            return i
+    copy_support(instr_item, index).orientation = other
+    instr_item.support_list_index = index
+    return len(instr_item.support_list) - 1
+
+
+class MakePair(Operator):
+    bl_idname = "make.pair"
+    bl_label = "Make Instrument Supports base and lid"
+    bl_description = "Creates base and lid supports at the same station, sharing one instrument section"
+    bl_options = {"REGISTER", "UNDO"}
+
+    @classmethod
+    def poll(cls, context):
+        instr = current_support_list_item(context)
+        if instr is None or context.scene.case_props.engine != 'DATA':
+            return False
+        else:
+            return instr.support is None or instr.preview
+
+    def execute(self, context):
+        instr_item = current_instr_list_item(context)
+        index = instr_item.support_list_index
+        if instr_item.support_list[index].preview:
+            remove_parts(instr_item.support_list[index])
+        # the selected support keeps its orientation, the companion gets the other
+        jobs = [(instr_item, instr_item.support_list[i], instr_item.support_list[i].orientation)
+                for i in (index, companion(instr_item, index))]
+        with profiled(context, instr_item.support_list[index].name + " pair"):
+            report = generate_supports(context, jobs)
+        for name, seconds, error in report:
+            if error is not None:
+                self.report({'ERROR'}, "{} failed: {}".format(name, error))
+                return {'CANCELLED'}
+        return {'FINISHED'}
+
+
+class RebuildSupport(Operator):
+    bl_idname = "make.rebuild"
+    bl_label = "Rebuild instrument support"
+    bl_description = "Rebuilds the support with its current settings, only the steps affected by changes are run again"
+    bl_options = {"REGISTER", "UNDO"}
+
+    @classmethod
+    def poll(cls, context):
+        instr = current_support_list_item(context)
+        if instr is None or context.scene.case_props.engine != 'DATA':
+            return False
+        else:
+            return instr.support is not None
+
+    def execute(self, context):
+        support_item = current_support_list_item(context)
+        orientation = support_item.orientation
+        remove_parts(support_item)
+        return generate(self, context, orientation)
+
+registration_list = (MakeSupports, MakeHolders, MakePair, MakeAll, RebuildSupport)
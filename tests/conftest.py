@@ -0,0 +1,72 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026 DTRabbit
+
+# Tests run with the bpy module, from the add-on directory
+#   python -m pytest tests
+
+import importlib
+import os
+import sys
+
+import pytest
+
+bpy = pytest.importorskip("bpy")
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ADDON_DIR = os.path.dirname(TESTS_DIR)
+
+sys.path.insert(0, os.path.dirname(ADDON_DIR))
+sys.path.insert(0, os.path.join(ADDON_DIR, "benchmarks"))
+
+def module(name):
+    return importlib.import_module(os.path.basename(ADDON_DIR) + "." + name)
+
+@pytest.fixture(scope="session")
+def addon():
+    """
+    The add-on package, registered for the whole session
+    Leaving it registered keeps the bpy module from exiting
+    """
+    package = importlib.import_module(os.path.basename(ADDON_DIR))
+    package.register()
+    yield package
+    package.unregister()
+
+@pytest.fixture
+def scene(addon):
+    """
+    The context scene, emptied of instruments, supports and cached state
+    """
+    scene = bpy.context.scene
+    for instr_item in scene.case_props.instrument_list:
+        for support_item in instr_item.support_list:
+            module("support_list").remove_parts(support_item)
+    scene.case_props.instrument_list.clear()
+    scene.case_props.instrument_list_index = -1
+    scene.case_props.live_preview = False
+    module("deferred").cancel()
+    module("utils").forget_lists()
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj)
+    bpy.data.orphans_purge(do_recursive=True)
+    module("extents").clear_cache()
+    module("generator").clear_stages()
+    module("sections").clear_cache()
+    return scene
+
+def add_instrument(scene, name, arrays, location=(0, 0, 0), rotation=(0, 0, 0)):
+    """
+    Instrument list item for a new instrument made from mesh arrays
+    """
+    mesh = module("meshops").mesh_from_arrays(bpy.data.meshes.new(name), *arrays)
+    obj = bpy.data.objects.new(name, mesh)
+    obj.location = location
+    obj.rotation_euler = rotation
+    scene.collection.objects.link(obj)
+    c_props = scene.case_props
+    c_props.instrument_list.add()
+    c_props.instrument_list[-1].instr = obj
+    c_props.instrument_list_index = len(c_props.instrument_list) - 1
+    module("utils").forget_lists()
+    bpy.context.view_layer.update()
+    return c_props.instrument_list[-1]
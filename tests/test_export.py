@@ -0,0 +1,53 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026 DTRabbit
+
+import zipfile
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pytest
+
+from conftest import module
+
+# a tetrahedron, wound outwards
+CO = np.array([(0, 0, 0), (1, 0, 0), (0, 1, 0), (0, 0, 1)], dtype=np.float32)
+TRIS = np.array([(0, 2, 1), (0, 1, 3), (0, 3, 2), (1, 2, 3)], dtype=np.int32)
+
+NS = {"m": "http://schemas.microsoft.com/3dmanufacturing/core/2015/02"}
+
+def test_write_stl(tmp_path):
+    export = module("export")
+    path = export.write_stl(str(tmp_path / "part.stl"), CO, TRIS)
+    data = open(path, "rb").read()
+    assert len(data) == 84 + 50 * len(TRIS)
+    assert data[:16] == b"Cases binary STL"
+    assert np.frombuffer(data[80:84], dtype="<u4")[0] == len(TRIS)
+    records = np.frombuffer(data[84:], dtype=export.STL_RECORD)
+    assert np.array_equal(records["verts"], CO[TRIS])
+    assert records["normal"][0] == pytest.approx((0, 0, -1))
+    assert records["normal"][3] == pytest.approx(np.full(3, 1 / np.sqrt(3)))
+    assert not records["attr"].any()
+
+def test_write_stl_degenerate(tmp_path):
+    export = module("export")
+    path = export.write_stl(str(tmp_path / "flat.stl"), CO, np.array([(0, 1, 1)], dtype=np.int32))
+    records = np.frombuffer(open(path, "rb").read()[84:], dtype=export.STL_RECORD)
+    assert not records["normal"].any()
+
+def test_write_3mf(tmp_path):
+    export = module("export")
+    parts = [("first", CO, TRIS), ("second", CO * 2, TRIS[:2])]
+    path = export.write_3mf(str(tmp_path / "parts.3mf"), parts, threads=2)
+    with zipfile.ZipFile(path) as z:
+        assert {"[Content_Types].xml", "_rels/.rels", "3D/3dmodel.model"} <= set(z.namelist())
+        model = ET.fromstring(z.read("3D/3dmodel.model"))
+    assert model.get("unit") == "millimeter"
+    objects = model.findall("m:resources/m:object", NS)
+    assert [(o.get("id"), o.get("name")) for o in objects] == [("1", "first"), ("2", "second")]
+    for obj, (name, co, tris) in zip(objects, parts):
+        vertices = [[float(v.get(a)) for a in "xyz"] for v in obj.findall("m:mesh/m:vertices/m:vertex", NS)]
+        triangles = [[int(t.get(a)) for a in ("v1", "v2", "v3")]
+                     for t in obj.findall("m:mesh/m:triangles/m:triangle", NS)]
+        assert np.allclose(vertices, co)
+        assert triangles == tris.tolist()
+    assert [i.get("objectid") for i in model.findall("m:build/m:item", NS)] == ["1", "2"]
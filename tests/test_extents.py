@@ -0,0 +1,29 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026 DTRabbit
+
+import bpy
+import pytest
+
+from conftest import module, add_instrument
+from shapes import tube
+
+def test_bounds_evicted_by_depsgraph_update(scene):
+    extents = module("extents")
+    obj = add_instrument(scene, "Tube", tube(400)).instr
+    low, high = extents.instruments_bounds([obj])
+    assert high[0] == pytest.approx(0.6)
+    assert obj.session_uid in extents._bounds_cache
+    version = extents.geometry_version(obj)
+    # same vertex count and transform, so only the depsgraph handler can tell
+    obj.data.vertices[0].co.x = 1.0
+    obj.data.update()
+    bpy.context.view_layer.update()
+    assert obj.session_uid not in extents._bounds_cache
+    assert extents.geometry_version(obj) != version
+    low, high = extents.instruments_bounds([obj])
+    assert high[0] == pytest.approx(1.0)
+    # moving the object is caught by the fingerprint as well
+    obj.location.z = 0.5
+    bpy.context.view_layer.update()
+    low, high = extents.instruments_bounds([obj])
+    assert low[2] == pytest.approx(0.48)
@@ -0,0 +1,183 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026 DTRabbit
+
+import json
+import os
+from types import SimpleNamespace
+
+import bpy
+import bmesh
+import numpy as np
+import pytest
+
+from conftest import module, add_instrument, ADDON_DIR
+from shapes import tube, bell
+
+X, Y, Z = 0, 1, 2
+
+def unbevelled_pad(monkeypatch, name):
+    """
+    A copy of the pad of a default base support on object name in
+    Example.blend, before its bevel, and the support's settings
+    """
+    bpy.ops.wm.open_mainfile(filepath=os.path.join(ADDON_DIR, "Example.blend"))
+    scene = bpy.context.scene
+    generator = module("generator")
+    pads = []
+    pad_bevel_edges = generator.pad_bevel_edges
+    def record(mesh, s):
+        pads.append(mesh.copy())
+        return pad_bevel_edges(mesh, s)
+    monkeypatch.setattr(generator, "pad_bevel_edges", record)
+    c_props = scene.case_props
+    c_props.engine = 'DATA'
+    c_props.instrument_list.add()
+    c_props.instrument_list[-1].instr = bpy.data.objects[name]
+    c_props.instrument_list_index = len(c_props.instrument_list) - 1
+    module("utils").forget_lists()
+    instr_item = c_props.instrument_list[-1]
+    support_item = module("support_list").new_support(instr_item, scene.support_props)
+    module("utils").update_case(scene)
+    generator.generate_support(bpy.context, instr_item, support_item, 'BASE')
+    assert len(pads) == 1
+    return pads[0], support_item
+
+def operator_pad_edges(mesh, s_props):
+    """
+    Edges the operator engine selected for the pad bevel before it was
+    replaced by pad_bevel_edges, in edit mode with shortest_path_select
+    """
+    obj = bpy.data.objects.new("PadEdges", mesh)
+    bpy.context.scene.collection.objects.link(obj)
+    bpy.context.view_layer.objects.active = obj
+    with bpy.context.temp_override(active_object=obj, object=obj):
+        assert bpy.ops.object.mode_set(mode='EDIT') == {'FINISHED'}
+        bpy.context.tool_settings.mesh_select_mode = (False, True, False)
+        bm = bmesh.from_edit_mesh(mesh)
+        ref_Z = round((s_props.separation / 2), 4)
+        candidate_edges, other_edges = [], []
+        high_X, low_X = 0, 0
+        for e in bm.edges:
+            e.select = False
+            for v in e.verts:
+                abs_Z = abs(round(v.co[Z], 4))
+                high_X = max(high_X, round(v.co[X], 4))
+                low_X = min(low_X, round(v.co[X], 4))
+                if ref_Z == abs_Z and round(e.other_vert(v).co[Z], 4) == round(v.co[Z], 4):
+                    if round(e.other_vert(v).co[X], 4) == round(v.co[X], 4):
+                        if e not in candidate_edges:
+                            candidate_edges.append(e)
+                    elif e not in other_edges:
+                        other_edges.append(e)
+        loop_edges = [[e for e in candidate_edges if round(e.verts[0].co[X], 4) == high_X],
+                      [e for e in candidate_edges if round(e.verts[0].co[X], 4) == low_X]]
+        low_Y = min(abs(round(v.co[Y], 4)) for e in other_edges for v in e.verts)
+        inner_edges = [e for e in other_edges
+                       if low_Y in (abs(round(e.verts[0].co[Y], 4)), abs(round(e.verts[1].co[Y], 4)))]
+        bmesh.update_edit_mesh(mesh)
+        for l in loop_edges:
+            for e in l:
+                e.select = True
+            bmesh.update_edit_mesh(mesh)
+            bpy.ops.mesh.shortest_path_select()
+            bm = bmesh.from_edit_mesh(mesh)
+        bm.edges.ensure_lookup_table()
+        for e in inner_edges:
+            bm.edges[e.index].select = True
+        selected = {e.index for e in bm.edges if e.select}
+        bpy.ops.object.mode_set(mode='OBJECT')
+    bpy.data.objects.remove(obj)
+    return selected
+
+@pytest.mark.parametrize("name", ["Instrument", "Instrument2"])
+def test_pad_bevel_edges(addon, monkeypatch, name):
+    pad, support_item = unbevelled_pad(monkeypatch, name)
+    edges = module("generator").pad_bevel_edges(pad, support_item.support_props)
+    assert set(edges.tolist()) == operator_pad_edges(pad.copy(), support_item.support_props)
+    if name == "Instrument":
+        assert len(support_item.pad.data.vertices) == 276
+
+def test_build_and_export(scene, tmp_path):
+    scene.case_props.engine = 'DATA'
+    instr_item = add_instrument(scene, "Tube", tube(4000))
+    jobs = []
+    for orientation in ('BASE', 'LID'):
+        support_item = module("support_list").new_support(instr_item, scene.support_props)
+        support_item.support_props.position = 0.3
+        support_item.orientation = orientation
+        jobs.append((instr_item, support_item, orientation))
+    module("utils").update_case(scene)
+    generator = module("generator")
+    results = generator.build_supports(scene, generator.scene_depsgraph(scene), jobs)
+    assert [error for name, seconds, error in results] == [None, None]
+    for instr_item, support_item, orientation in jobs:
+        parts = (support_item.support, support_item.pad, support_item.clamp, support_item.nut_plate)
+        assert all(part is not None and len(part.data.polygons) > 0 for part in parts)
+        assert all(part.users_collection[0] == instr_item.parts for part in parts)
+        # base supports sit under the instrument and lid supports over it
+        z = support_item.support.matrix_world.translation[2]
+        assert (z < 0) if orientation == 'BASE' else (z > 0)
+    export = module("export")
+    files = export.export_parts(scene, str(tmp_path / "stl"))
+    assert len(files) == 8
+    assert all(os.path.getsize(f) > 84 for f in files)
+    files = export.export_parts(scene, str(tmp_path / "3mf"), '3MF')
+    assert len(files) == 1 and os.path.getsize(files[0]) > 0
+
+def test_bell_supports_manifold(scene):
+    # the bell flare cuts the holder corner at these stations, too close to
+    # the edges for a full bevel
+    scene.case_props.engine = 'DATA'
+    instr_item = add_instrument(scene, "Bell", bell(10000))
+    jobs = []
+    for position in (0.1, 0.2):
+        support_item = module("support_list").new_support(instr_item, scene.support_props)
+        support_item.support_props.position = position
+        jobs.append((instr_item, support_item, 'BASE'))
+    module("utils").update_case(scene)
+    generator = module("generator")
+    results = generator.build_supports(scene, generator.scene_depsgraph(scene), jobs)
+    assert [error for name, seconds, error in results] == [None, None]
+    non_manifold_edges = module("meshops").non_manifold_edges
+    for instr_item, support_item, orientation in jobs:
+        for part in (support_item.support, support_item.pad):
+            assert len(non_manifold_edges(part.data)) == 0
+
+def test_empty_proxy(scene):
+    # the remesher gives at least a voxel for any faces, so only an empty
+    # instrument comes out empty
+    empty = (np.empty((0, 3)), np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32))
+    instr_item = add_instrument(scene, "Empty", empty)
+    generator = module("generator")
+    with pytest.raises(RuntimeError, match="came out empty"):
+        module("proxy").instrument_proxy(instr_item.instr, generator.scene_depsgraph(scene), 0.001)
+
+def test_worker_failure_in_result(tmp_path):
+    task_file = str(tmp_path / "task.json")
+    with open(task_file, "w") as f:
+        json.dump({"result": str(tmp_path / "missing")}, f)
+    stations = [(SimpleNamespace(name="S0"), 'BASE', None), (SimpleNamespace(name="S0.001"), 'LID', None)]
+    report = module("parallel").read_result(task_file, stations, None, "worker failed: out of memory")
+    assert report == [("S0", 0.0, "worker failed: out of memory"), ("S0.001", 0.0, "worker failed: out of memory")]
+
+def test_stage_cache_after_slot_length_edit(scene):
+    scene.case_props.engine = 'DATA'
+    instr_item = add_instrument(scene, "Tube", tube(4000))
+    support_item = module("support_list").new_support(instr_item, scene.support_props)
+    support_item.support_props.position = 0.3
+    module("utils").update_case(scene)
+    generator = module("generator")
+    profiling = module("profiling")
+    job = [(instr_item, support_item, 'BASE')]
+    generator.build_supports(scene, generator.scene_depsgraph(scene), job)
+    module("support_list").remove_parts(support_item)
+    support_item.support_props.slot_length += 0.002
+    with profiling.session("rebuild") as profile:
+        results = generator.build_supports(scene, generator.scene_depsgraph(scene), job)
+    assert results[0][2] is None
+    cached = {e["name"]: e["cached"] for e in profile.events if "cached" in e}
+    assert cached == {"section": True, "pad_shell": True, "support_block": True, "gap_cut": True,
+                      "split": True, "flange": False, "bevel": False, "nut_plate": False,
+                      "fastener_cuts": False}
+    # the instrument is not read again either
+    assert "instrument slab" not in {e["name"] for e in profile.events}
@@ -0,0 +1,21 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026 DTRabbit
+
+import numpy as np
+import pytest
+
+from conftest import module, add_instrument
+from shapes import tube
+
+def test_run_moved_instrument(scene):
+    instr_item = add_instrument(scene, "Tube", tube(2000))
+    report = module("headless").run({
+        "instruments": [{"object": "Tube", "location": [0.1, 0.2, 0.05],
+                         "stations": [{"position": 0.3}]}]})
+    assert report["ok"], report
+    support_item = instr_item.support_list[0]
+    # the support is built where the instrument was moved to
+    co = np.array([support_item.pad.matrix_world @ v.co for v in support_item.pad.data.vertices])
+    centre = (co.min(axis=0) + co.max(axis=0)) / 2
+    assert centre[0] == pytest.approx(0.4, abs=0.002)
+    assert centre[1] == pytest.approx(0.2, abs=0.002)
@@ -0,0 +1,115 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026 DTRabbit
+
+import bpy
+import bmesh
+import numpy as np
+import pytest
+
+from conftest import module
+
+def bounds(mesh):
+    co = np.array([v.co for v in mesh.vertices])
+    return co.min(axis=0), co.max(axis=0)
+
+def test_scratch_booleans(addon):
+    meshops = module("meshops")
+    meshes = len(bpy.data.meshes)
+    with meshops.Scratch() as scratch:
+        union = scratch.block("union", (0, 0, 0), (1, 1, 1))
+        scratch.boolean(union, 'UNION', scratch.block("other", (0.5, 0, 0), (1, 1, 1)))
+        low, high = bounds(union)
+        assert low == pytest.approx((-0.5, -0.5, -0.5))
+        assert high == pytest.approx((1.0, 0.5, 0.5))
+
+        difference = scratch.block("difference", (0, 0, 0), (1, 1, 1))
+        scratch.boolean(difference, 'DIFFERENCE', scratch.block("cut", (0.5, 0, 0), (1, 1, 1)))
+        low, high = bounds(difference)
+        assert len(difference.vertices) == 8
+        assert low == pytest.approx((-0.5, -0.5, -0.5))
+        assert high == pytest.approx((0.0, 0.5, 0.5))
+
+        # several operands in one pass
+        both = scratch.block("both", (0, 0, 0), (1, 1, 1))
+        scratch.boolean(both, 'DIFFERENCE', [scratch.block("left", (-0.5, 0, 0), (0.2, 2, 2)),
+                                             scratch.block("right", (0.5, 0, 0), (0.2, 2, 2))])
+        low, high = bounds(both)
+        assert low[0] == pytest.approx(-0.4)
+        assert high[0] == pytest.approx(0.4)
+    assert len(bpy.data.meshes) == meshes
+    assert module("meshops").SCRATCH_NAME not in bpy.data.scenes
+
+def open_box(scratch, name, center):
+    """
+    Unit block with its top face removed, so four of its edges have one face
+    """
+    mesh = scratch.block(name, center, (1, 1, 1))
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    bmesh.ops.delete(bm, geom=[max(bm.faces, key=lambda f: f.calc_center_median()[2])], context='FACES_ONLY')
+    bm.to_mesh(mesh)
+    bm.free()
+    return mesh
+
+def test_scratch_boolean_non_manifold(addon):
+    meshops = module("meshops")
+    with meshops.Scratch() as scratch:
+        target = scratch.block("target", (0, 0, 0), (1, 1, 1))
+        assert len(meshops.non_manifold_edges(target)) == 0
+        operand = open_box(scratch, "open", (0.5, 0, 0))
+        assert len(meshops.non_manifold_edges(operand)) == 4
+        # the solver would leave target as it is, that must not pass silently
+        with pytest.raises(RuntimeError, match="non-manifold"):
+            scratch.boolean(target, 'DIFFERENCE', [scratch.block("cut", (-0.5, 0, 0), (0.2, 2, 2)), operand])
+        with pytest.raises(RuntimeError, match="non-manifold"):
+            scratch.boolean(operand, 'UNION', target)
+        assert len(target.vertices) == 8
+
+def test_weld_seams(addon):
+    meshops = module("meshops")
+    bm = bmesh.new()
+    # two blocks meeting at X = 0, with doubled vertices along the seam
+    meshops.bm_block(bm, (-0.5, 0, 0), (1, 1, 1))
+    meshops.bm_block(bm, (0.5, 0, 0), (1, 1, 1))
+    # a close pair away from the seam is left alone
+    bm.verts.new((0.3, 2, 2))
+    bm.verts.new((0.3005, 2, 2))
+    mesh = bpy.data.meshes.new("Seam")
+    bm.to_mesh(mesh)
+    bm.free()
+    assert meshops.weld_seams(mesh, [(0, 0.0)]) == 4
+    assert len(mesh.vertices) == 14
+    co = meshops.mesh_coords(mesh)
+    assert np.count_nonzero(np.isclose(co[:, 0], 0.0)) == 4
+    assert np.count_nonzero(np.isclose(co[:, 1], 2)) == 2
+    assert meshops.weld_seams(mesh, [(1, 0.5)]) == 0
+    bpy.data.meshes.remove(mesh)
+
+def test_vertex_components():
+    vertex_components = module("meshops").vertex_components
+    # a chain joined out of order, a pair and a lone vertex
+    edges = np.array([(4, 5), (0, 4), (2, 5), (1, 3)])
+    labels = vertex_components(7, edges)
+    assert len(np.unique(labels)) == 3
+    assert labels[0] == labels[2] == labels[4] == labels[5]
+    assert labels[1] == labels[3] != labels[0]
+    assert labels[6] not in labels[:6]
+    assert vertex_components(3, np.empty((0, 2), dtype=np.int32)).tolist() == [0, 1, 2]
+
+def test_largest_parts(addon):
+    meshops = module("meshops")
+    with meshops.Scratch() as scratch:
+        bm = bmesh.new()
+        meshops.bm_block(bm, (0, 0, 0), (0.1, 0.1, 0.1))
+        meshops.bm_block(bm, (1, 0, 0), (0.2, 0.2, 0.2))
+        # a sliver under MIN_PART_VOLUME
+        meshops.bm_block(bm, (2, 0, 0), (0.001, 0.001, 0.001))
+        mesh = scratch.mesh("Parts", bm)
+        face_labels, volumes = meshops.loose_part_volumes(mesh)
+        assert sorted(volumes) == pytest.approx([1e-9, 0.001, 0.008])
+        large, small = meshops.largest_parts(mesh, ["Large", "Small"], new_mesh=scratch.mesh)
+        assert len(large.polygons) == len(small.polygons) == 6
+        assert meshops.mesh_dimensions(large) == pytest.approx((0.2, 0.2, 0.2))
+        assert meshops.mesh_dimensions(small) == pytest.approx((0.1, 0.1, 0.1))
+        with pytest.raises(ValueError, match="2 parts, expected 3"):
+            meshops.largest_parts(mesh, ["A", "B", "C"], new_mesh=scratch.mesh)
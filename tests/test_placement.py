@@ -0,0 +1,21 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026 DTRabbit
+
+import numpy as np
+
+from conftest import module
+from shapes import bell
+
+def test_place_stations_avoid_bell_flare():
+    co, loop_start, loop_verts = bell(20000)
+    s = module("sections").Sections(co.astype(np.float64), loop_verts.reshape(-1, 3), 0.001)
+    stations = module("placement").place_stations(s, 0.0, 3, 0.03)
+    assert len(stations) == 3
+    # the bell's radius passes placement.FLARE times the tube's near here
+    radius = 0.012 + 0.11 * (s.xs / 0.5) ** 5
+    flare_X = s.xs[np.argmax(radius > module("placement").FLARE * 0.0154)]
+    for position, span in stations:
+        assert position - span / 2 >= 0
+        assert position + span / 2 < flare_X
+    # spread out rather than bunched below the flare
+    assert stations[-1][0] - stations[0][0] > flare_X / 2
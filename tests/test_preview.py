@@ -0,0 +1,44 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026 DTRabbit
+
+from conftest import module, add_instrument
+from shapes import tube
+
+def preview_support(scene):
+    scene.case_props.engine = 'DATA'
+    scene.case_props.live_preview = True
+    instr_item = add_instrument(scene, "Tube", tube(4000))
+    support_item = module("support_list").new_support(instr_item, scene.support_props)
+    support_item.support_props.position = 0.3
+    module("utils").update_case(scene)
+    return instr_item, support_item
+
+def test_preview_keeps_full_stages(scene):
+    instr_item, support_item = preview_support(scene)
+    generator = module("generator")
+    job = [(instr_item, support_item, 'BASE')]
+    generator.build_supports(scene, generator.scene_depsgraph(scene), job)
+    full = dict(generator._support_stages[support_item.name])
+    module("support_list").remove_parts(support_item)
+    module("preview").build_preview(scene, support_item.name)
+    assert support_item.preview
+    assert generator._support_stages[support_item.name] == full
+    assert all(signature in generator._stage_store for signature in full.values())
+    assert generator._preview_stages[support_item.name] != full
+
+def test_build_full_keeps_preview_on_error(scene, monkeypatch):
+    instr_item, support_item = preview_support(scene)
+    preview = module("preview")
+    preview.build_preview(scene, support_item.name)
+    module("deferred").cancel()
+    parts = preview.support_parts(support_item)
+    names = [obj.name for obj in parts]
+    monkeypatch.setattr(preview, "build_supports", lambda scene, depsgraph, jobs: [(jobs[0][1].name, 0.0, "failed")])
+    preview.build_full(scene, support_item.name)
+    assert support_item.preview and support_item.error == "failed"
+    assert preview.support_parts(support_item) == parts
+    monkeypatch.undo()
+    preview.build_full(scene, support_item.name)
+    assert not support_item.preview and support_item.error == ""
+    assert [obj.name for obj in preview.support_parts(support_item)] == names
+    assert all(obj.show_wire is False for obj in preview.support_parts(support_item))
@@ -0,0 +1,65 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026 DTRabbit
+
+import json
+
+import bpy
+
+from conftest import module
+
+def test_profile_nesting():
+    profiling = module("profiling")
+    profile = profiling.Profile("run")
+    outer = profile.begin("outer")
+    profile.lap("first")
+    profile.ops += 2
+    profile.lap("second")
+    inner = profile.begin("inner", size=3)
+    profile.end(outer)
+    assert profile.open == []
+    names = [(e["name"], e["depth"]) for e in profile.events]
+    assert names == [("outer", 0), ("first", 1), ("second", 1), ("inner", 2)]
+    first, second = profile.events[1], profile.events[2]
+    assert first["ops"] == 2 and second["ops"] == 0
+    assert inner["size"] == 3
+    assert outer["seconds"] >= first["seconds"] + second["seconds"]
+
+def test_profile_totals_and_dump(tmp_path):
+    profiling = module("profiling")
+    profile = profiling.Profile("run")
+    for i in range(3):
+        event = profile.begin("boolean UNION")
+        event["verts_in"], event["verts_out"] = 10, 4
+        profile.end(event)
+    profile.lap("tail")
+    profile.finish()
+    totals = profile.totals()
+    assert totals["boolean UNION"]["count"] == 3
+    assert totals["boolean UNION"]["verts_in"] == 30
+    assert totals["boolean UNION"]["verts_out"] == 12
+    assert totals["tail"]["count"] == 1
+    profile.dump(str(tmp_path / "profile.json"))
+    assert json.load(open(tmp_path / "profile.json"))["name"] == "run"
+    profile.dump(str(tmp_path / "trace.json"), 'CHROME')
+    trace = json.load(open(tmp_path / "trace.json"))["traceEvents"]
+    assert len(trace) == 4
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in trace)
+
+def test_session():
+    profiling = module("profiling")
+    meshes = []
+    with profiling.session("off", enabled=False) as profile:
+        assert profile is None
+        with profiling.stage("ignored"):
+            pass
+    with profiling.session("on") as profile:
+        with profiling.stage("outer", step=1):
+            profiling.count_op()
+            meshes.append(bpy.data.meshes.new("Orphan"))
+            with profiling.session("nested") as nested:
+                assert nested is None
+    assert profiling.last_profile is profile
+    assert [(e["name"], e["ops"], e["step"]) for e in profile.events] == [("outer", 1, 1)]
+    assert profile.orphans == 1
+    assert "orphans" not in profile.events[0]
+    bpy.data.meshes.remove(meshes[0])
@@ -0,0 +1,71 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026 DTRabbit
+
+import numpy as np
+import pytest
+
+from conftest import module
+from shapes import loft
+
+def prism(length, ry, rz, segments, reverse=False):
+    """
+    (co, tris) of a closed prism along X from 0 to length, with polygon
+    sections through the ellipse with semi axes ry and rz
+    """
+    x = np.array([0.0, length])
+    co, loop_start, loop_verts = loft(x, np.full(2, ry), np.full(2, rz), segments)
+    tris = loop_verts.reshape(-1, 3)
+    return co.astype(np.float64), tris[:, ::-1] if reverse else tris
+
+def polygon_area(ry, rz, segments):
+    return segments / 2 * ry * rz * np.sin(2 * np.pi / segments)
+
+def test_slice_segments():
+    sections = module("sections")
+    co, tris = prism(0.1, 0.02, 0.01, 8)
+    xs = np.array([-0.01, 0.025, 0.05, 0.2])
+    plane, segments = sections.slice_segments(co, tris, xs)
+    # planes outside the prism cut nothing, the others cut both triangles
+    # of each side face
+    assert np.bincount(plane, minlength=len(xs)).tolist() == [0, 16, 16, 0]
+    assert segments.shape == (32, 2, 2)
+    assert np.abs(segments[..., 0]).max() == pytest.approx(0.02)
+    assert np.abs(segments[..., 1]).max() == pytest.approx(0.01)
+
+def test_slice_segments_empty():
+    sections = module("sections")
+    plane, segments = sections.slice_segments(np.empty((0, 3)), np.empty((0, 3), dtype=np.int32),
+                                              np.array([0.0]))
+    assert len(plane) == 0
+    assert segments.shape == (0, 2, 2)
+
+def test_sections_area_and_extents():
+    sections = module("sections")
+    co, tris = prism(0.1, 0.02, 0.01, 16)
+    s = sections.Sections(co, tris, 0.01)
+    assert len(s.xs) == 10
+    assert s.xs[0] == pytest.approx(0.005)
+    assert s.area == pytest.approx(polygon_area(0.02, 0.01, 16))
+    assert s.y_max == pytest.approx(0.02)
+    assert s.y_min == pytest.approx(-0.02)
+    assert s.z_max - s.z_min == pytest.approx(0.02)
+    assert s.index(0.031) == 3
+    assert s.radii(0.05) == pytest.approx((0.02, 0.01))
+
+def test_sections_hollow():
+    sections = module("sections")
+    outer_co, outer_tris = prism(0.1, 0.02, 0.02, 12)
+    inner_co, inner_tris = prism(0.1, 0.01, 0.01, 12, reverse=True)
+    co = np.concatenate([outer_co, inner_co])
+    tris = np.concatenate([outer_tris, inner_tris + len(outer_co)])
+    s = sections.Sections(co, tris, 0.02)
+    assert s.area == pytest.approx(polygon_area(0.02, 0.02, 12) - polygon_area(0.01, 0.01, 12))
+
+def test_sections_polylines():
+    sections = module("sections")
+    co, tris = prism(0.1, 0.02, 0.01, 8)
+    s = sections.Sections(co, tris, 0.05)
+    lines = s.polylines(0)
+    assert len(lines) == 1
+    assert len(lines[0]) == 17
+    assert lines[0][0] == pytest.approx(lines[0][-1])
@@ -0,0 +1,59 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026 DTRabbit
+
+import bpy
+import numpy as np
+import pytest
+
+from conftest import module, add_instrument
+from shapes import tube
+
+def make_support(scene, instr_item, position, orientation='BASE'):
+    support_item = module("support_list").new_support(instr_item, scene.support_props)
+    support_item.support_props.position = position
+    support_item.orientation = orientation
+    instr_item.support_list_index = len(instr_item.support_list) - 1
+    return support_item
+
+def test_operators_engine_rotated_instrument(scene):
+    scene.case_props.engine = 'OPERATORS'
+    scene.case_props.use_proxy = False
+    co, loop_start, loop_verts = tube(2000)
+    # origin in the middle, so the station is on the axis when rotated
+    co[:, 0] -= 0.3
+    instr_item = add_instrument(scene, "Tube", (co, loop_start, loop_verts), rotation=(0, 0, 0.3))
+    support_item = make_support(scene, instr_item, 0.0)
+    module("utils").update_case(scene)
+    assert bpy.ops.make.supports() == {'FINISHED'}
+    for part in (support_item.support, support_item.pad, support_item.clamp, support_item.nut_plate):
+        assert part is not None
+        assert len(part.data.polygons) > 0
+    # the rotation is applied to the mesh, and the world matrix follows
+    instrument = instr_item.instr
+    assert tuple(instrument.rotation_euler) == pytest.approx((0, 0, 0))
+    assert instrument.matrix_world == instrument.matrix_basis
+    # the pad wraps the tube cut at an angle, wider than its 0.04 diameter
+    assert support_item.pad.dimensions[1] > 0.04 / np.cos(0.3)
+
+def test_make_pair_keeps_orientation(scene):
+    scene.case_props.engine = 'DATA'
+    instr_item = add_instrument(scene, "Tube", tube(2000))
+    make_support(scene, instr_item, 0.3, 'LID')
+    module("utils").update_case(scene)
+    assert bpy.ops.make.pair() == {'FINISHED'}
+    assert instr_item.support_list_index == 0
+    assert [(s.orientation, s.support is not None) for s in instr_item.support_list] == \
+        [('LID', True), ('BASE', True)]
+    # items move as the list grows, look the lid up again
+    assert instr_item.support_list[0].support.matrix_world.translation[2] > 0
+
+def test_batch_keeps_selected_support(scene):
+    scene.case_props.engine = 'OPERATORS'
+    scene.case_props.use_proxy = False
+    instr_item = add_instrument(scene, "Tube", tube(2000))
+    jobs = [(instr_item, make_support(scene, instr_item, x), 'BASE') for x in (0.1, 0.4)]
+    instr_item.support_list_index = 0
+    module("utils").update_case(scene)
+    report = module("supports").build_support_batch(None, bpy.context, jobs)
+    assert [error for name, seconds, error in report] == [None, None]
+    assert instr_item.support_list_index == 0
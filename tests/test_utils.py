@@ -0,0 +1,117 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026 DTRabbit
+
+import bpy
+import bmesh
+import pytest
+
+from conftest import module, add_instrument
+from shapes import tube
+
+def test_temporary_memory(scene):
+    utils = module("utils")
+    mesh_bytes = module("meshops").mesh_bytes
+    block = utils.add_block("Block", (0, 0, 0), (1, 1, 1))
+    cylinder = utils.add_cylinder("Cylinder", (0.5, 0, 0), 0.3, 2, vertices=64)
+    before = mesh_bytes(block.data) + mesh_bytes(cylinder.data)
+    utils.add_and_apply_bool(block, 'UNION', cylinder, del_object=True)
+    # the union is counted at its new size, the cylinder mesh is still held
+    peak = mesh_bytes(block.data) + mesh_bytes(bpy.data.meshes["Cylinder"])
+    assert peak > before
+    utils.delete_object(block)
+    assert utils.purge_temporaries() == (2, peak)
+    assert utils.purge_temporaries() == (0, 0)
+
+def test_boolean_non_manifold(scene):
+    utils = module("utils")
+    block = utils.add_block("Block", (0, 0, 0), (1, 1, 1))
+    cutter = utils.add_block("Cutter", (0.5, 0, 0), (1, 1, 1))
+    bm = bmesh.new()
+    bm.from_mesh(cutter.data)
+    bmesh.ops.delete(bm, geom=bm.faces[:1], context='FACES_ONLY')
+    bm.to_mesh(cutter.data)
+    bm.free()
+    with pytest.raises(RuntimeError, match="non-manifold"):
+        utils.add_and_apply_bools(block, 'DIFFERENCE', [cutter])
+    assert len(block.data.vertices) == 8
+    assert not block.modifiers
+
+def test_sync_fittings_changed_only(scene):
+    s_props, f_props = scene.support_props, scene.fittings_props
+    s_props.nut_diam = 0.01
+    f_props.screw_diam = 0.005
+    module("deferred").flush()
+    assert s_props.screw_diam == f_props.screw_diam
+    assert s_props.nut_diam == pytest.approx(0.01)
+
+def test_clearance_update_reads_moved_instruments(scene):
+    instr_item = add_instrument(scene, "Tube", tube(400))
+    utils = module("utils")
+    utils.update_case(scene)
+    location = tuple(scene.case_props.location)
+    instr_item.instr.location.x += 1
+    bpy.context.view_layer.update()
+    scene.case_props.clearance += 0.01
+    module("deferred").flush()
+    assert scene.case_props.location[0] == pytest.approx(location[0] + 1)
+
+def test_apply_transformations_shared_mesh(scene):
+    utils = module("utils")
+    block = utils.add_block("Block", (0, 0, 0), (1, 1, 1))
+    twin = bpy.data.objects.new("Twin", block.data)
+    scene.collection.objects.link(twin)
+    block.location = (1, 2, 3)
+    utils.apply_transformations(block, L=True)
+    assert block.data is not twin.data
+    assert tuple(block.location) == (0, 0, 0)
+    assert block.data.vertices[0].co.x == pytest.approx(twin.data.vertices[0].co.x + 1)
+
+def test_boolean_plan_merges():
+    plan = module("utils").BooleanPlan()
+    for cutter in ("slot0", "slot1"):
+        plan.add("holder", 'DIFFERENCE', cutter)
+        plan.add("nut_plate", 'DIFFERENCE', "nut_" + cutter)
+    plan.add("holder", 'INTERSECT', "box0")
+    plan.add("holder", 'INTERSECT', "box1")
+    assert plan.groups() == [["holder", 'DIFFERENCE', ["slot0", "slot1"]],
+                             ["nut_plate", 'DIFFERENCE', ["nut_slot0", "nut_slot1"]],
+                             ["holder", 'INTERSECT', ["box0"]],
+                             ["holder", 'INTERSECT', ["box1"]]]
+    calls = []
+    assert plan.execute(lambda *call: calls.append(call)) == 4
+    assert calls[0] == ("holder", 'DIFFERENCE', ["slot0", "slot1"])
+    assert plan.steps == []
+
+def test_boolean_plan_no_merge_past_a_read():
+    plan = module("utils").BooleanPlan()
+    plan.add("holder", 'UNION', "flange")
+    # the pad reads the holder as it is here
+    plan.add("pad", 'DIFFERENCE', "holder")
+    plan.add("holder", 'UNION', "post")
+    # the cutter changes between two uses of it
+    plan.add("clamp", 'DIFFERENCE', "cutter")
+    plan.add("cutter", 'UNION', "extra")
+    plan.add("clamp", 'DIFFERENCE', "cutter")
+    assert [(g[0], g[2]) for g in plan.groups()] == [("holder", ["flange"]), ("pad", ["holder"]),
+                                                      ("holder", ["post"]), ("clamp", ["cutter"]),
+                                                      ("cutter", ["extra"]), ("clamp", ["cutter"])]
+
+def test_active_items_forgotten_on_list_changes(scene):
+    utils = module("utils")
+    new_support = module("support_list").new_support
+    instr_item = add_instrument(scene, "Tube", tube(400))
+    new_support(instr_item, scene.support_props)
+    assert utils.active_items(bpy.context)[1].name == "Tube_S0"
+    assert utils._active is not None
+    # items move in memory as the lists change, the memo must not outlive that
+    new_support(instr_item, scene.support_props)
+    assert utils._active is None
+    assert utils.active_items(bpy.context)[1].name == "Tube_S1"
+    assert bpy.ops.support_list.delete_item() == {'FINISHED'}
+    assert utils._active is None
+    assert utils.active_items(bpy.context)[1].name == "Tube_S0"
+    assert utils.registered_instruments(scene) == {instr_item.instr.session_uid}
+    assert bpy.ops.instrument_list.delete_item() == {'FINISHED'}
+    assert utils._active is None
+    assert utils.active_items(bpy.context) == (None, None)
+    assert utils.registered_instruments(scene) == set()
@@ -5,6 +5,8 @@ from bpy.types import Panel
 from .support_props import support_props_list
 from .materials_props import materials_props_list
 from .fittings_props import fittings_props_list
+from .utils import active_items
+from . import profiling
 
 def show_support_props(box, props, props_active):
     for p in support_props_list:
@@ -100,11 +102,12 @@ class SupportsPanel(SideBar, Panel):
         c_props = context.scene.case_props
         this_support = s_props
         props_active = False
-        if c_props.instrument_list_index >= 0:
-            sl_props = c_props.instrument_list[c_props.instrument_list_index]
+        instr_item, support_item = active_items(context)
+        if instr_item is not None:
+            sl_props = instr_item
             support_list_active = True
-            if sl_props.support_list_index >= 0:
-                this_support = sl_props.support_list[sl_props.support_list_index].support_props
+            if support_item is not None:
+                this_support = support_item.support_props
                 props_active = True
         else:
             sl_props = context.scene.case_props
@@ -117,15 +120,57 @@ class SupportsPanel(SideBar, Panel):
         row.operator('support_list.new_item', text="ADD")
         row.operator('support_list.copy_item', text="COPY")
         row.operator('support_list.delete_item', text="REMOVE")
+        row.operator('support_list.place', text="AUTO")
         row = box.row()
         row.enabled = props_active
         row.prop(this_support, "position")
+        if props_active:
+            box.row().prop(support_item, "orientation", expand=True)
         show_support_props(box, this_support, props_active)
         box.row().label(text="Generate")
+        box.row().prop(c_props, "engine", expand=True)
+        row = box.row()
+        row.prop(c_props, "use_proxy")
+        row.prop(c_props, "live_preview")
+        if props_active and support_item.error:
+            box.row().label(text=support_item.error, icon='ERROR')
         row = box.row()
         row.enabled = props_active
         row.operator('make.supports', text="Base")
         row.operator('make.holder', text="Lid")
+        row.operator('make.pair', text="Both")
+        row.operator('make.rebuild', text="Rebuild")
         row.operator('support_list.delete_objects', text="Remove")
+        row = box.row()
+        row.operator('make.all', text="Generate all")
+        row.prop(c_props, "workers")
+        box.row().operator('export.supports', text="Export all")
+
+
+class ProfilePanel(SideBar, Panel):
+    bl_label = "Profile"
+    bl_parent_id = "SupportsPanel"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    def draw(self, context):
+        box = self.layout.box()
+        box.row().prop(context.scene.case_props, "profile")
+        profile = profiling.last_profile
+        if profile is None:
+            box.row().label(text="Nothing recorded yet")
+            return
+        box.row().label(text="{}, {} orphans left".format(profile.name, profile.orphans))
+        grid = box.grid_flow(row_major=True, columns=5, align=True)
+        for heading in ("Stage", "Count", "ms", "Verts in/out", "Ops"):
+            grid.label(text=heading)
+        for name, t in profile.totals().items():
+            grid.label(text=name)
+            grid.label(text=str(t["count"]))
+            grid.label(text="{:.1f}".format(t["seconds"] * 1000))
+            grid.label(text="{}/{}".format(t["verts_in"], t["verts_out"]) if t["verts_in"] else "")
+            grid.label(text=str(t["ops"]))
+        row = box.row()
+        row.operator('profile.dump', text="Save JSON").format = 'JSON'
+        row.operator('profile.dump', text="Save trace").format = 'CHROME'
 
-registration_list = (CasesPanel, MaterialsPanel, FittingsPanel, InstPanel, SupportsDefaultsPanel, SupportsPanel)
+registration_list = (CasesPanel, MaterialsPanel, FittingsPanel, InstPanel, SupportsDefaultsPanel, SupportsPanel, ProfilePanel)
@@ -4,8 +4,13 @@
 import bpy
 import bmesh
 
-from math import prod
-from mathutils import Vector
+from bpy.app.handlers import persistent
+from mathutils import Matrix, Vector
+
+from .extents import instruments_bounds
+from .meshops import (weld_seams, largest_parts, mesh_bytes, bm_cylinder, require_manifold,
+                      remove_doubles as mesh_remove_doubles)
+from .profiling import count_op, boolean, stage
 
 # Globals - hopefully I can get rid of these at a later date
 # 'constants' for vector indexing
@@ -14,21 +19,35 @@ Y = 1
 Z = 2
 XYZ = (X,Y,Z)
 
-def average(l=[]):
-    return sum(l) / len(l) if len(l) > 0 else 0
+# The active instrument and support list items, looked up many times per
+# redraw by panels and polls, are memoised until a timer drops them once the
+# redraw is over. Code that adds or removes list items, and undo and file
+# loads, drop them straight away with forget_lists()
+_active = None
+_clear_pending = False
+# session uids of each scene's instrument objects, keyed by scene pointer,
+# with the instrument list length they were collected at
+_registered = {}
 
-def select_objects(objects, replace=True):
-    if replace: bpy.ops.object.select_all(action='DESELECT')
-    for obj in objects:
-        bpy.data.objects[obj.name].select_set(True)
-    bpy.context.view_layer.objects.active = objects[0]
+# Temporary meshes made by add_block and add_cylinder
+# Deleting an object leaves its mesh behind as orphan data, so these are
+# freed together by purge_temporaries() when a generation finishes
+_temporaries = []
+# size (bytes) of each temporary mesh by pointer, their total and the most
+# the total has been since the last purge
+_temporary_bytes = {}
+_total_bytes = 0
+_peak_bytes = 0
 
-def select_object(object, replace=True):
-    select_objects([object], replace)
+def average(l=[]):
+    return sum(l) / len(l) if len(l) > 0 else 0
 
 def delete_objects(objects):
-    select_objects(objects)
-    bpy.ops.object.delete()
+    """
+    Delete objects with the data API, the selection is left alone and the
+    meshes are left for purge_temporaries()
+    """
+    bpy.data.batch_remove([o for o in objects if o is not None])
 
 def delete_object(object):
     """
@@ -36,32 +55,211 @@ def delete_object(object):
     """
     delete_objects([object])
 
-def duplicate_and_join(name="DUP_AND_JOIN", objects=[]):
-    select_objects(objects)
-    bpy.ops.object.duplicate()
-    if len(objects) > 1:
-        bpy.ops.object.join()
-    bpy.context.active_object.name = name
-    return bpy.context.active_object
+def link_object(obj, collection=None):
+    """
+    Link obj to collection, or the active collection
+    """
+    (collection or bpy.context.collection).objects.link(obj)
+    return obj
+
+def move_objects(objects, collection):
+    """
+    Link objects to collection only
+    """
+    for obj in objects:
+        if obj is None:
+            continue
+        for c in obj.users_collection:
+            if c != collection:
+                c.objects.unlink(obj)
+        if collection not in obj.users_collection:
+            collection.objects.link(obj)
+
+def parts_collection(scene, instr_item):
+    """
+    The collection the generated parts of instrument list item instr_item
+    go in, made and linked to scene the first time it's needed
+    """
+    collection = instr_item.parts
+    if collection is None:
+        collection = bpy.data.collections.new(instr_item.instr.name + "_supports")
+        instr_item.parts = collection
+    if collection not in scene.collection.children_recursive:
+        scene.collection.children.link(collection)
+    return collection
+
+def remove_parts_collection(instr_item):
+    """
+    Remove the parts collection of instr_item if nothing is left in it
+    """
+    collection = instr_item.parts
+    if collection is not None and len(collection.all_objects) == 0:
+        instr_item.parts = None
+        bpy.data.collections.remove(collection)
+
+def live_temporaries():
+    """
+    Registered temporary meshes that have not been removed yet
+    """
+    live = []
+    for mesh in _temporaries:
+        try:
+            mesh.users
+        except ReferenceError:
+            continue
+        live.append(mesh)
+    return live
+
+def note_temporary_memory(mesh):
+    """
+    Measure mesh again if it is temporary, after it has changed
+    """
+    global _total_bytes, _peak_bytes
+    key = mesh.as_pointer()
+    if key not in _temporary_bytes:
+        return
+    size = mesh_bytes(mesh)
+    _total_bytes += size - _temporary_bytes[key]
+    _temporary_bytes[key] = size
+    _peak_bytes = max(_peak_bytes, _total_bytes)
+
+def temporary(obj):
+    """
+    Register obj's mesh as temporary
+    """
+    _temporaries.append(obj.data)
+    _temporary_bytes[obj.data.as_pointer()] = 0
+    note_temporary_memory(obj.data)
+    return obj
+
+def purge_temporaries():
+    """
+    Free the registered meshes nothing uses any more in one batch, the ones
+    still in use are generated parts and are left alone
+    Returns (meshes freed, peak temporary memory in bytes)
+    """
+    global _total_bytes, _peak_bytes
+    with stage("purge temporaries") as event:
+        orphans = [m for m in live_temporaries() if m.users == 0]
+        if len(orphans) > 0:
+            bpy.data.batch_remove(orphans)
+        peak, _total_bytes, _peak_bytes = _peak_bytes, 0, 0
+        _temporaries.clear()
+        _temporary_bytes.clear()
+        if event is not None:
+            event["freed"], event["peak_bytes"] = len(orphans), peak
+    return len(orphans), peak
+
+def _clear_active():
+    global _active, _clear_pending
+    _active = None
+    _clear_pending = False
+    return None
+
+def forget_lists():
+    """
+    Drop the memo of the active list items and the registered instruments,
+    after instrument or support list items have been added or removed
+    """
+    global _active
+    _active = None
+    _registered.clear()
+
+def active_items(context):
+    """
+    (instrument list item, support list item) that are active in context's
+    scene, either can be None
+    """
+    global _active, _clear_pending
+    scene = context.scene
+    c_props = scene.case_props
+    index = c_props.instrument_list_index
+    key = (scene.as_pointer(), index, len(c_props.instrument_list))
+    if _active is not None and _active[0] == key:
+        instr_item = _active[1]
+        if instr_item is None or _active[2] == (instr_item.support_list_index, len(instr_item.support_list)):
+            return instr_item, _active[3]
+    instr_item = c_props.instrument_list[index] if -1 < index < key[2] else None
+    support_item, support_key = None, None
+    if instr_item is not None:
+        support_key = (instr_item.support_list_index, len(instr_item.support_list))
+        if -1 < support_key[0] < support_key[1]:
+            support_item = instr_item.support_list[support_key[0]]
+    _active = (key, instr_item, support_key, support_item)
+    if not _clear_pending and not bpy.app.background:
+        bpy.app.timers.register(_clear_active, first_interval=0.0)
+        _clear_pending = True
+    return instr_item, support_item
 
 def current_instr_list_item(context):
-    return context.scene.case_props.instrument_list[context.scene.case_props.instrument_list_index] if context.scene.case_props.instrument_list_index > -1 else None
+    return active_items(context)[0]
 
 def current_instr(context):
-    return current_instr_list_item(context).instr if current_instr_list_item(context) is not None else None
+    instr_item = active_items(context)[0]
+    return instr_item.instr if instr_item is not None else None
 
 def current_support_list_item(context):
-    props = current_instr_list_item(context)
-    return None if props is None else props.support_list[props.support_list_index] if props.support_list_index > -1 else None
+    return active_items(context)[1]
+
+def registered_instruments(scene):
+    """
+    Set of the session uids of the objects in scene's instrument list
+    """
+    instrument_list = scene.case_props.instrument_list
+    entry = _registered.get(scene.as_pointer())
+    if entry is None or entry[0] != len(instrument_list):
+        entry = (len(instrument_list), {item.instr.session_uid for item in instrument_list
+                                        if item.instr is not None})
+        _registered[scene.as_pointer()] = entry
+    return entry[1]
+
+@persistent
+def lists_changed(*args):
+    forget_lists()
+
+def register_handlers():
+    for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post, bpy.app.handlers.load_post):
+        if lists_changed not in handlers:
+            handlers.append(lists_changed)
+
+def unregister_handlers():
+    for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post, bpy.app.handlers.load_post):
+        if lists_changed in handlers:
+            handlers.remove(lists_changed)
+    if bpy.app.timers.is_registered(_clear_active):
+        bpy.app.timers.unregister(_clear_active)
+    _clear_active()
+    forget_lists()
 
 def set_mode(obj, new_mode):
     m = obj.mode
-    bpy.ops.object.mode_set(mode=new_mode)
+    if m != new_mode:
+        count_op()
+        with bpy.context.temp_override(active_object=obj, object=obj):
+            bpy.ops.object.mode_set(mode=new_mode)
     return m
 
 def apply_transformations(object, L = False, R = False, S = False):
-    select_object(object)
-    bpy.ops.object.transform_apply(location=L, rotation=R, scale=S)
+    """
+    Apply the location, rotation and / or scale of object to its mesh with
+    the data API, the parts not applied stay on the object
+    A mesh shared with other objects is copied first, so only object moves
+    """
+    if not (L or R or S):
+        return
+    if object.data.users > 1:
+        object.data = object.data.copy()
+    basis = object.matrix_basis.copy()
+    loc, rot, scale = basis.decompose()
+    kept = Matrix.Translation(loc if not L else Vector()) @ \
+           (rot.to_matrix().to_4x4() if not R else Matrix()) @ \
+           (Matrix.Diagonal(scale).to_4x4() if not S else Matrix())
+    object.data.transform(kept.inverted() @ basis)
+    object.matrix_basis = kept
+    # matrix_world is only refreshed by a depsgraph update, set it here as
+    # callers read it straight away
+    parent = object.parent.matrix_world @ object.matrix_parent_inverse if object.parent else Matrix()
+    object.matrix_world = parent @ kept
 
 def add_block(block_name, block_location, block_scale):
     """
@@ -69,18 +267,22 @@ def add_block(block_name, block_location, block_scale):
     """
     obj = bpy.data.objects.new(name=block_name, object_data=bpy.data.meshes.new(name=block_name))
     obj.location = block_location
-    bpy.context.collection.objects.link(obj)
+    link_object(obj)
     bm = bmesh.new()
     bmesh.ops.create_cube(bm)
     bm.to_mesh(obj.data)
     obj.scale=block_scale
     apply_transformations(obj, S=True)
-    return obj
+    return temporary(obj)
 
 def add_cylinder(name="C", location=[0,0,0], radius=1, depth=1, vertices=32):
-    bpy.ops.mesh.primitive_cylinder_add(radius=radius, depth=depth, location=location, vertices=vertices)
-    bpy.context.active_object.name = name
-    return bpy.context.active_object
+    mesh = bpy.data.meshes.new(name)
+    bm = bm_cylinder(bmesh.new(), (0, 0, 0), radius, depth, vertices)
+    bm.to_mesh(mesh)
+    bm.free()
+    obj = bpy.data.objects.new(name, mesh)
+    obj.location = location
+    return temporary(link_object(obj))
 
 def add_bool(owner, name, operation, object):
     """
@@ -93,38 +295,120 @@ def add_bool(owner, name, operation, object):
     boolean = owner.modifiers.new(name, 'BOOLEAN')
     boolean.operation = operation
     boolean.solver = 'MANIFOLD'
-    boolean.object = object
+    if isinstance(object, bpy.types.Collection):
+        boolean.operand_type = 'COLLECTION'
+        boolean.collection = object
+    else:
+        boolean.object = object
 
 def apply_mod(owner, mod_name):
     """
     Apply boolean bool_name to owner
     """
-    select_object(owner)
-    bpy.ops.object.modifier_apply(modifier=mod_name, use_selected_objects=True)
+    count_op()
+    with bpy.context.temp_override(active_object=owner, object=owner, selected_objects=[owner]):
+        bpy.ops.object.modifier_apply(modifier=mod_name)
 
 def add_and_apply_bool(owner, operation, object, del_object = False):
-    add_bool(owner, "temp_bool", operation, object)
-    apply_mod(owner, "temp_bool")
+    operands = [o.data for o in object.objects] if isinstance(object, bpy.types.Collection) else [object.data]
+    require_manifold([owner.data] + operands, operation)
+    with boolean(owner.data, operation, operands):
+        add_bool(owner, "temp_bool", operation, object)
+        apply_mod(owner, "temp_bool")
+    note_temporary_memory(owner.data)
     if del_object: delete_object(object)
 
-def remove_doubles(obj):
-    select_object(obj)
-    m = set_mode(obj, 'EDIT')
-    bpy.ops.mesh.select_all(action='SELECT')
-    bpy.ops.mesh.remove_doubles(threshold=0.001)
-    set_mode(obj, m)
+def add_and_apply_bools(owner, operation, objects, del_objects=False):
+    """
+    Apply a boolean of all objects to owner in one solver pass, through a
+    temporary collection if there is more than one
+    """
+    if len(objects) == 1:
+        add_and_apply_bool(owner, operation, objects[0], del_objects)
+        return
+    collection = bpy.data.collections.new("TEMP_OPERANDS")
+    bpy.context.scene.collection.children.link(collection)
+    for o in objects:
+        collection.objects.link(o)
+    add_and_apply_bool(owner, operation, collection)
+    bpy.context.scene.collection.children.unlink(collection)
+    bpy.data.collections.remove(collection)
+    if del_objects: delete_objects(objects)
+
+class BooleanPlan:
+    """
+    Queue of boolean operations that are run with the fewest solver calls
+    Operations on the same target with the same operation are merged into one
+    call with several operands, as long as nothing in between reads the
+    target or changes one of the operands
+    Only UNION and DIFFERENCE are merged, A - B - C == A - (B + C)
+    """
+
+    mergeable = ('UNION', 'DIFFERENCE')
+
+    def __init__(self):
+        self.steps = []
+
+    def add(self, target, operation, operand):
+        self.steps.append((target, operation, operand))
+
+    def groups(self):
+        """
+        [target, operation, [operands]] in the order they have to run
+        """
+        groups = []
+        for target, operation, operand in self.steps:
+            merged = False
+            for g in reversed(groups):
+                if g[0] == target:
+                    if g[1] == operation and operation in self.mergeable:
+                        g[2].append(operand)
+                        merged = True
+                    break
+                if g[0] == operand or target in g[2]:
+                    break
+            if not merged:
+                groups.append([target, operation, [operand]])
+        return groups
+
+    def execute(self, apply):
+        """
+        Run the plan, apply(target, operation, operands) does each solver call
+        Returns the number of calls
+        """
+        groups = self.groups()
+        for target, operation, operands in groups:
+            apply(target, operation, operands)
+        self.steps = []
+        return len(groups)
+
+def remove_doubles(obj, planes=None):
+    """
+    Merge vertices of obj closer than 1mm, works in any mode
+    planes: (axis, value) planes in obj's space where booleans left seams,
+            if given only vertices on them are considered
+    """
+    if planes is None:
+        mesh_remove_doubles(obj.data, dist=0.001)
+    else:
+        weld_seams(obj.data, planes, dist=0.001)
 
 def separate_parts(obj, large_name="Support", small_name="Clamp"):
-    global X,Y,Z
-    select_object(obj)
-    m = set_mode(obj, 'EDIT')
-    bpy.ops.mesh.separate(type='LOOSE')
-    volumes = [prod(o.dimensions) for o in bpy.context.selected_objects]
-    large, small = (0, 1) if volumes[0] > volumes[1] else (1,0)
-    bpy.context.selected_objects[large].name=large_name
-    bpy.context.selected_objects[small].name=small_name
-    set_mode(obj, m)
-    return bpy.context.selected_objects[large], bpy.context.selected_objects[small]
+    """
+    Replace obj by new objects for its two largest loose parts by volume,
+    slivers are dropped
+    """
+    parts = []
+    for mesh in largest_parts(obj.data, (large_name, small_name)):
+        part = bpy.data.objects.new(mesh.name, mesh)
+        part.matrix_world = obj.matrix_world
+        for c in obj.users_collection:
+            c.objects.link(part)
+        parts.append(part)
+    mesh = obj.data
+    bpy.data.objects.remove(obj)
+    bpy.data.meshes.remove(mesh)
+    return parts[0], parts[1]
 
 def is_object_mode(context):
     for o in context.selected_objects:
@@ -132,41 +416,25 @@ def is_object_mode(context):
             return False
     return True
 
-def instrument_radii(object, position):
-    global X,Y,Z
-    b1 = add_block("b1", position, (0.0001,1,1))
-    add_and_apply_bool(b1, 'INTERSECT', object)
-    radii = (b1.dimensions[Y]/2, b1.dimensions[Z]/2)
-    delete_object(b1)
-    return radii
-
-def calc_case(self, context):
-    c_props = context.scene.case_props
-    if len(c_props.instrument_list) > 0:
-        # store current selection
-        selected_objects = context.selected_objects[:]
-        active_object = context.active_object
-
-        parts = [o.instr for o in c_props.instrument_list]
-        obj = duplicate_and_join("TEMP_JOINED_INSTRUMENTS", parts)
-        rel_bb = [Vector(p) for p in obj.bound_box]
-        abs_bb = [obj.location + v for v in rel_bb]
-        abs_bb_XYZ = [[], [], []]
-        for p in abs_bb:
-            for c in XYZ:
-                abs_bb_XYZ[c].append(p[c])
-        abs_bb_min_max_XYZ = [[min(v) for v in abs_bb_XYZ], [max(v) for v in abs_bb_XYZ]]
-        c_props.size = [abs_bb_min_max_XYZ[1][c] - abs_bb_min_max_XYZ[0][c] + c_props.clearance * 2 for c in XYZ]
-        c_props.location = [average([abs_bb_min_max_XYZ[1][c], abs_bb_min_max_XYZ[0][c]]) for c in XYZ]
+def update_case(scene):
+    """
+    Recalculate the case size and location for scene
+    The instrument boxes are cached per object, so this only reads the
+    geometry of instruments that changed
+    """
+    c_props = scene.case_props
+    bounds = instruments_bounds([o.instr for o in c_props.instrument_list])
+    if bounds is not None:
+        bb_min, bb_max = bounds
+        c_props.size = [float(bb_max[c] - bb_min[c]) + c_props.clearance * 2 for c in XYZ]
+        c_props.location = [float(average([bb_max[c], bb_min[c]])) for c in XYZ]
         c_props.base_Z = c_props.location[Z] - (c_props.size[Z] / 2)
         c_props.lid_Z = c_props.location[Z] + (c_props.size[Z] / 2)
-        delete_object(obj)
-        # restore initial selection
-        if len(selected_objects) > 0:
-            select_objects(selected_objects)
-            bpy.context.view_layer.objects.active = active_object
     else:
         c_props.size = Vector([0,0,0])
         c_props.location = Vector([0,0,0])
         c_props.base_Z = 0
         c_props.lid_Z = 0
+
+def calc_case(self, context):
+    update_case(context.scene)
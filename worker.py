@@ -0,0 +1,29 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026 DTRabbit
+
+# Support generation worker, started by parallel.generate_supports_parallel
+#   blender -b --factory-startup --python worker.py -- task.json [task.json ...]
+#   python worker.py task.json [task.json ...]      (with the bpy module)
+
+import importlib
+import os
+import sys
+
+def main(argv):
+    tasks = argv[argv.index("--") + 1:] if "--" in argv else argv[1:]
+    # import the add-on as a package so its relative imports work
+    addon_dir = os.path.dirname(os.path.abspath(__file__))
+    sys.path.insert(0, os.path.dirname(addon_dir))
+    package = importlib.import_module(os.path.basename(addon_dir))
+    parallel = importlib.import_module(package.__name__ + ".parallel")
+    failed = 0
+    for task in tasks:
+        try:
+            parallel.run_task(task)
+        except Exception as e:
+            print("Cases worker:", task, "failed:", e, file=sys.stderr)
+            failed += 1
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main(sys.argv)